@@ -48,7 +48,7 @@ version = 0.1
 #
 # Keep requirements minimal to reduce APK/AAB size.
 # NOTE: `pillow` is large and the frontend code doesn't import/use PIL, so omit it.
-requirements = python3,kivy,requests,pyjnius
+requirements = python3,kivy,requests,requests-toolbelt,pyjnius
 
 # Extra python-for-android flags.
 #
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 
 def get_database_url() -> str:
@@ -21,6 +22,10 @@ def get_database_url() -> str:
         # Local fallback for dev/testing
         return "sqlite:///./app.db"
 
+    return _psycopg_url(url)
+
+
+def _psycopg_url(url: str) -> str:
     if url.startswith("postgres://"):
         return url.replace("postgres://", "postgresql+psycopg://", 1)
 
@@ -39,10 +44,39 @@ connect_args = (
     else {}
 )
 
+# Explicit QueuePool sizing for Postgres: the defaults (5 + 10 overflow) were
+# exhausted under concurrent polling. Tunable per deployment via env.
+pool_args = (
+    {}
+    if DATABASE_URL.startswith("sqlite")
+    else {
+        "poolclass": QueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    }
+)
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
     connect_args=connect_args,
+    **pool_args,
+)
+
+# Optional read replica for read-only lookups. Without DATABASE_READ_URL the
+# read sessions simply use the primary engine.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+read_engine = (
+    create_engine(
+        _psycopg_url(DATABASE_READ_URL),
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        **pool_args,
+    )
+    if DATABASE_READ_URL
+    else engine
 )
 
 SessionLocal = sessionmaker(
@@ -51,6 +85,12 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    autocommit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
 
 
@@ -60,3 +100,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for endpoints that only read; may lag the primary slightly."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -33,9 +33,10 @@ from frontend_app.utils.api import (
     ApiError,
     api_next_profile,
     api_start_session,
-    api_swipe,
+    api_swipe_async,
     api_verify_subscription,
     api_video_match,
+    set_auth_token,
 )
 from frontend_app.utils.billing import BillingManager
 from frontend_app.utils.storage import clear, get_user, set_user
@@ -283,15 +284,9 @@ class ChooseScreen(Screen):
         # Optimistic UI: Load next profile immediately
         self.refresh_profile()
 
-        def work():
-            try:
-                api_swipe(target_user_id=tid, direction=direction)
-            except ApiError as exc:
-                # Swipe failed, but we already moved on. 
-                # Ideally we might queue this or retry, but for now just log/ignore for UI speed.
-                pass
-
-        Thread(target=work, daemon=True).start()
+        # Swipe failures are ignored: we already moved on.
+        # Ideally we might queue this or retry, but for now just log/ignore for UI speed.
+        api_swipe_async(target_user_id=tid, direction=direction)
     
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
@@ -423,5 +418,6 @@ class ChooseScreen(Screen):
 
     def logout(self) -> None:
         clear()
+        set_auth_token("")
         if self.manager:
             self.manager.current = "login"
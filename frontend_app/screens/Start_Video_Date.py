@@ -10,7 +10,7 @@ from kivy.uix.screenmanager import Screen
 from kivy.utils import platform
 
 from frontend_app.utils.android_camera import get_android_camera_ids
-from frontend_app.utils.api import ApiError, api_get_messages, api_post_message, api_video_end, api_video_match
+from frontend_app.utils.api import ApiError, api_get_messages, api_post_message_async, api_video_end, api_video_match
 from frontend_app.utils.storage import get_user
 
 
@@ -490,14 +490,7 @@ class StartVideoDateScreen(Screen):
 
         inp.text = ""
 
-        def work():
-            try:
-                api_post_message(session_id=sid, message=msg)
-                Clock.schedule_once(lambda *_: self._poll_chat(0), 0)
-            except ApiError:
-                pass
-
-        Thread(target=work, daemon=True).start()
+        api_post_message_async(session_id=sid, message=msg, on_done=lambda _data: self._poll_chat(0))
 
     def go_back(self) -> None:
         self._stop_spinner()
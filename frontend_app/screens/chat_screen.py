@@ -9,7 +9,7 @@ from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import Screen
 from kivy.metrics import dp
 
-from frontend_app.utils.api import ApiError, api_get_messages, api_post_message
+from frontend_app.utils.api import ApiError, api_get_messages, api_post_message_async
 from frontend_app.utils.storage import get_last_read_message_id, get_user, set_last_read_message_id
 
 
@@ -133,18 +133,15 @@ class ChatScreen(Screen):
         if not msg:
             return
 
-        def work():
-            try:
-                api_post_message(session_id=sid, message=msg)
-
-                def after(*_):
-                    if inp:
-                        inp.text = ""
-                    self.refresh_messages()
-
-                Clock.schedule_once(after, 0)
-            except ApiError as exc:
-                _popup("Error", str(exc))
-
-        Thread(target=work, daemon=True).start()
+        def after(_data):
+            if inp:
+                inp.text = ""
+            self.refresh_messages()
+
+        api_post_message_async(
+            session_id=sid,
+            message=msg,
+            on_done=after,
+            on_error=lambda exc: _popup("Error", str(exc)),
+        )
 
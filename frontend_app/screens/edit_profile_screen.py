@@ -7,7 +7,7 @@ from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.utils import platform
 
-from frontend_app.utils.api import ApiError, api_update_profile, api_verify_subscription, api_upload_profile_image
+from frontend_app.utils.api import ApiError, api_update_profile, api_verify_subscription, api_upload_profile_image, set_auth_token
 from frontend_app.utils.storage import get_user, set_session, get_token, get_remember_me, clear, set_user
 from frontend_app.utils.billing import BillingManager
 
@@ -276,6 +276,7 @@ class EditProfileScreen(Screen):
 
     def logout(self):
         clear()
+        set_auth_token("")
         if self.manager:
             self.manager.current = "login"
 
@@ -7,7 +7,7 @@ from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import Screen
 
-from frontend_app.utils.api import ApiError, api_guest, api_login_request_otp, api_login_verify_otp
+from frontend_app.utils.api import ApiError, api_guest, api_login_request_otp, api_login_verify_otp, set_auth_token
 from frontend_app.utils.storage import get_remember_me, set_remember_me, set_session
 
 
@@ -145,6 +145,7 @@ class LoginScreen(Screen):
 
                 set_remember_me(bool(self.remember_me))
                 set_session(token=token, user=user, remember=bool(self.remember_me))
+                set_auth_token(token)
 
                 def after(*_):
                     if self.manager:
@@ -162,13 +163,15 @@ class LoginScreen(Screen):
         def work():
             try:
                 data = api_guest()
+                token = data.get("access_token") or ""
                 # Guests should not be persisted by default.
                 set_remember_me(False)
                 set_session(
-                    token=(data.get("access_token") or ""),
+                    token=token,
                     user=(data.get("user") or {}),
                     remember=False,
                 )
+                set_auth_token(token)
                 Clock.schedule_once(lambda *_: setattr(self.manager, "current", "choose"), 0)
             except ApiError as exc:
                 _popup("Error", str(exc))
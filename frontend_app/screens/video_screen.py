@@ -623,6 +623,12 @@ class VideoScreen(Screen):
         self.session_id = int(sess.get("id") or 0)
         self.channel = str(payload.get("channel") or "")
         self.agora_app_id = str(payload.get("agora_app_id") or "")
+        # Start creating the engine now; join waits on permissions first.
+        try:
+            if self._agora and self.agora_app_id:
+                self._agora.prewarm(app_id=self.agora_app_id)
+        except Exception:
+            pass
         try:
             self.agora_uid = int(payload.get("agora_uid") or 0)
         except Exception:
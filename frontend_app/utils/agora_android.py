@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import threading
+from collections import deque
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Callable, Optional
-from weakref import ref
+from weakref import WeakValueDictionary
 
 from kivy.clock import Clock
 from kivy.logger import Logger
@@ -23,6 +26,131 @@ class AgoraJoinInfo:
     uid: int
 
 
+# Live clients keyed by id(); Java callbacks resolve their parent through this.
+_CLIENTS: "WeakValueDictionary[int, AgoraAndroidClient]" = WeakValueDictionary()
+_JAVA_CLASSES: dict = {}
+
+
+def _java_classes() -> dict:
+    """
+    Define the PyJNIus proxy classes once per process (Android only).
+
+    Defining them per call produced a fresh class each time, so PyJNIus could
+    never reuse its reflected method lookups across engines/buttons.
+    """
+    if _JAVA_CLASSES:
+        return _JAVA_CLASSES
+
+    from jnius import PythonJavaClass, java_method  # type: ignore
+
+    class EventHandler(PythonJavaClass):  # type: ignore[misc]
+        __javainterfaces__ = ["io/agora/rtc2/IRtcEngineEventHandler"]
+        __javacontext__ = "app"
+
+        def __init__(self, client_id: int):
+            super().__init__()
+            self._client_id = client_id
+
+        @java_method("(Ljava/lang/String;II)V")
+        def onJoinChannelSuccess(self, channel, uid, elapsed):  # noqa: N802
+            parent = _CLIENTS.get(self._client_id)
+            if not parent:
+                return
+            ch = str(channel) if channel is not None else ""
+            u = int(uid)
+
+            def _cb(*_):
+                parent._joined = True
+                if parent._on_join_success:
+                    parent._on_join_success(ch, u)
+
+            Clock.schedule_once(_cb, 0)
+
+        @java_method("(II)V")
+        def onUserJoined(self, uid, elapsed):  # noqa: N802
+            parent = _CLIENTS.get(self._client_id)
+            if not parent:
+                return
+            parent._queue_user_event(True, int(uid))
+
+        @java_method("(II)V")
+        def onUserOffline(self, uid, reason):  # noqa: N802
+            parent = _CLIENTS.get(self._client_id)
+            if not parent:
+                return
+            parent._queue_user_event(False, int(uid))
+
+    class ClickListener(PythonJavaClass):  # type: ignore[misc]
+        __javainterfaces__ = ["android/view/View$OnClickListener"]
+        __javacontext__ = "app"
+
+        def __init__(self, client_id: int):
+            super().__init__()
+            self._client_id = client_id
+
+        @java_method("(Landroid/view/View;)V")
+        def onClick(self, v):  # noqa: N802
+            parent = _CLIENTS.get(self._client_id)
+            if not parent:
+                return
+
+            def _cb(*_):
+                try:
+                    parent.leave()
+                except Exception:
+                    pass
+                try:
+                    if parent._on_end_requested:
+                        parent._on_end_requested()
+                except Exception:
+                    pass
+
+            Clock.schedule_once(_cb, 0)
+
+    _JAVA_CLASSES["EventHandler"] = EventHandler
+    _JAVA_CLASSES["ClickListener"] = ClickListener
+    return _JAVA_CLASSES
+
+
+_VIEW_CONSTS: Optional[SimpleNamespace] = None
+
+
+def _view_consts() -> SimpleNamespace:
+    """
+    Resolve the Java classes and static int constants used for overlay views once.
+
+    Each `Gravity.X` / `LayoutParams.X` access is a reflected JNI field read, so
+    they are materialized as plain Python ints here instead of per view mutation.
+    """
+    global _VIEW_CONSTS
+    if _VIEW_CONSTS is not None:
+        return _VIEW_CONSTS
+
+    from jnius import autoclass  # type: ignore
+
+    VideoCanvas = autoclass("io.agora.rtc2.video.VideoCanvas")
+    FrameLayout = autoclass("android.widget.FrameLayout")
+    FrameLayoutLayoutParams = autoclass("android.widget.FrameLayout$LayoutParams")
+    ViewGroupLayoutParams = autoclass("android.view.ViewGroup$LayoutParams")
+    Gravity = autoclass("android.view.Gravity")
+    Button = autoclass("android.widget.Button")
+
+    _VIEW_CONSTS = SimpleNamespace(
+        VideoCanvas=VideoCanvas,
+        FrameLayout=FrameLayout,
+        FrameLayoutLayoutParams=FrameLayoutLayoutParams,
+        ViewGroupLayoutParams=ViewGroupLayoutParams,
+        Button=Button,
+        render_hidden=int(VideoCanvas.RENDER_MODE_HIDDEN),
+        match_parent=int(ViewGroupLayoutParams.MATCH_PARENT),
+        wrap_content=int(FrameLayoutLayoutParams.WRAP_CONTENT),
+        grav_center=int(Gravity.CENTER),
+        grav_bottom_right=int(Gravity.BOTTOM) | int(Gravity.RIGHT),
+        grav_bottom_center=int(Gravity.BOTTOM) | int(Gravity.CENTER_HORIZONTAL),
+    )
+    return _VIEW_CONSTS
+
+
 class AgoraAndroidClient:
     """
     Thin Agora RTC wrapper for Kivy (Android) using PyJNIus.
@@ -51,11 +179,60 @@ class AgoraAndroidClient:
         self._handler = None
         self._activity = None
         self._container = None
+        # True while a container _create is queued but hasn't run on the UI thread.
+        self._container_pending = False
         self._remote_view = None
         self._local_view = None
         self._end_button = None
         self._end_click_listener = None
+        # Set as soon as an overlay build is queued, before the UI thread runs it.
+        self._overlay_requested = False
+        # Views we attached to the overlay container (removed individually).
+        self._children: list = []
         self._joined = False
+        # When not None, UI operations are collected here instead of being posted.
+        self._ui_batch: Optional[list] = None
+        # Remote join/leave events arrive on a Java thread; they are queued and
+        # drained together on the Kivy clock (see _queue_user_event).
+        self._event_lock = threading.Lock()
+        self._pending_events: deque = deque()
+        self._drain_scheduled = False
+        # Serializes engine creation between prewarm() and join().
+        self._engine_lock = threading.Lock()
+        _CLIENTS[id(self)] = self
+
+    def _queue_user_event(self, joined: bool, uid: int) -> None:
+        """
+        Record a remote join/leave (any thread) and schedule one coalesced drain.
+        """
+        with self._event_lock:
+            self._pending_events.append((joined, uid))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        Clock.schedule_once(self._drain_events, 0.05)
+
+    def _drain_events(self, *_):
+        with self._event_lock:
+            events = list(self._pending_events)
+            self._pending_events.clear()
+            self._drain_scheduled = False
+
+        # Keep only the latest state per uid (in order of last occurrence).
+        latest: dict = {}
+        for joined, uid in events:
+            latest.pop(uid, None)
+            latest[uid] = joined
+
+        for uid, joined in latest.items():
+            try:
+                if joined:
+                    if self._on_user_joined:
+                        self._on_user_joined(uid)
+                elif self._on_user_offline:
+                    self._on_user_offline(uid)
+            except Exception:
+                Logger.exception("AgoraAndroidClient: remote user callback failed")
 
     @property
     def is_available(self) -> bool:
@@ -68,6 +245,9 @@ class AgoraAndroidClient:
     def _run_on_ui_thread(self, fn) -> None:
         if platform != "android":
             return
+        if self._ui_batch is not None:
+            self._ui_batch.append(fn)
+            return
         try:
             from android.runnable import run_on_ui_thread  # type: ignore
 
@@ -79,6 +259,42 @@ class AgoraAndroidClient:
             except Exception:
                 Logger.exception("AgoraAndroidClient: failed running UI operation")
 
+    def _run_batch_on_ui_thread(self, *fns) -> None:
+        """
+        Run several UI operations in order with a single post to the UI thread.
+        """
+        ops = [fn for fn in fns if fn is not None]
+        if not ops:
+            return
+
+        def _batch():
+            for fn in ops:
+                try:
+                    fn()
+                except Exception:
+                    Logger.exception("AgoraAndroidClient: failed running batched UI operation")
+
+        self._run_on_ui_thread(_batch)
+
+    def _build_overlay(self, *, remote_uid: int, local_uid: int, clear: bool) -> None:
+        """
+        Create (optionally after clearing) the remote view, local PiP and End button
+        as one batch, so all view mutations land in the same UI-thread pass.
+        """
+        self._overlay_requested = True
+        self._ui_batch = []
+        try:
+            if clear:
+                self._clear_views()
+            self._add_remote_view(uid=remote_uid)
+            if local_uid and (clear or self._local_view is None):
+                self._add_local_view(uid=local_uid)
+            if clear or self._end_button is None:
+                self._add_end_button()
+        finally:
+            ops, self._ui_batch = self._ui_batch, None
+        self._run_batch_on_ui_thread(*ops)
+
     def _create_video_view(self):
         """
         Create an Android View suitable for Agora video rendering.
@@ -135,67 +351,46 @@ class AgoraAndroidClient:
             except Exception:
                 return None
 
+    def prewarm(self, *, app_id: str) -> None:
+        """
+        Create the RtcEngine on a background thread so a later join() only has
+        to call joinChannel.
+        """
+        if platform != "android" or self._engine is not None or not (app_id or "").strip():
+            return
+
+        def _work():
+            try:
+                self.ensure_engine(app_id=app_id)
+            finally:
+                try:
+                    from jnius import detach  # type: ignore
+
+                    detach()
+                except Exception:
+                    pass
+
+        threading.Thread(target=_work, daemon=True, name="agora-prewarm").start()
+
     def ensure_engine(self, *, app_id: str) -> bool:
         if platform != "android":
             return False
         if self._engine is not None:
             return True
+        with self._engine_lock:
+            if self._engine is not None:
+                return True
+            return self._create_engine(app_id=app_id)
 
+    def _create_engine(self, *, app_id: str) -> bool:
         try:
-            from jnius import autoclass, PythonJavaClass, java_method  # type: ignore
+            from jnius import autoclass  # type: ignore
 
             PythonActivity = autoclass("org.kivy.android.PythonActivity")
             activity = PythonActivity.mActivity
             context = activity.getApplicationContext()
 
-            parent_ref = ref(self)
-
-            class EventHandler(PythonJavaClass):  # type: ignore[misc]
-                __javainterfaces__ = ["io/agora/rtc2/IRtcEngineEventHandler"]
-                __javacontext__ = "app"
-
-                @java_method("(Ljava/lang/String;II)V")
-                def onJoinChannelSuccess(self, channel, uid, elapsed):  # noqa: N802
-                    parent = parent_ref()
-                    if not parent:
-                        return
-                    ch = str(channel) if channel is not None else ""
-                    u = int(uid)
-
-                    def _cb(*_):
-                        parent._joined = True
-                        if parent._on_join_success:
-                            parent._on_join_success(ch, u)
-
-                    Clock.schedule_once(_cb, 0)
-
-                @java_method("(II)V")
-                def onUserJoined(self, uid, elapsed):  # noqa: N802
-                    parent = parent_ref()
-                    if not parent:
-                        return
-                    u = int(uid)
-
-                    def _cb(*_):
-                        if parent._on_user_joined:
-                            parent._on_user_joined(u)
-
-                    Clock.schedule_once(_cb, 0)
-
-                @java_method("(II)V")
-                def onUserOffline(self, uid, reason):  # noqa: N802
-                    parent = parent_ref()
-                    if not parent:
-                        return
-                    u = int(uid)
-
-                    def _cb(*_):
-                        if parent._on_user_offline:
-                            parent._on_user_offline(u)
-
-                    Clock.schedule_once(_cb, 0)
-
-            handler = EventHandler()
+            handler = _java_classes()["EventHandler"](id(self))
 
             RtcEngine = autoclass("io.agora.rtc2.RtcEngine")
             engine = None
@@ -238,7 +433,7 @@ class AgoraAndroidClient:
                 VideoEncoderConfiguration = autoclass("io.agora.rtc2.video.VideoEncoderConfiguration")
                 VideoDimensions = autoclass("io.agora.rtc2.video.VideoEncoderConfiguration$VideoDimensions")
                 # 640x360 is a conservative default for mobile RTC.
-                dims = VideoDimensions(int(640), int(360))
+                dims = VideoDimensions(640, 360)
                 cfg = VideoEncoderConfiguration()
                 try:
                     cfg.dimensions = dims
@@ -259,6 +454,10 @@ class AgoraAndroidClient:
             self._engine = engine
             self._handler = handler
             self._activity = activity
+            try:
+                _view_consts()
+            except Exception:
+                Logger.exception("AgoraAndroidClient: failed resolving view constants")
             return True
         except Exception:
             Logger.exception("AgoraAndroidClient: failed to initialize Agora engine")
@@ -270,31 +469,29 @@ class AgoraAndroidClient:
     def _ensure_container(self) -> None:
         if platform != "android":
             return
-        if self._container is not None:
+        if self._container is not None or self._container_pending:
             return
 
-        from jnius import autoclass  # type: ignore
-
-        FrameLayout = autoclass("android.widget.FrameLayout")
-        ViewGroupLayoutParams = autoclass("android.view.ViewGroup$LayoutParams")
+        c = _view_consts()
         activity = self._activity
         if activity is None:
             return
 
         def _create():
+            self._container_pending = False
+            if self._container is not None:
+                return
             try:
-                container = FrameLayout(activity)
+                container = c.FrameLayout(activity)
                 container.setClickable(False)
                 container.setFocusable(False)
-                params = ViewGroupLayoutParams(
-                    int(ViewGroupLayoutParams.MATCH_PARENT),
-                    int(ViewGroupLayoutParams.MATCH_PARENT),
-                )
+                params = c.ViewGroupLayoutParams(c.match_parent, c.match_parent)
                 activity.addContentView(container, params)
                 self._container = container
             except Exception:
                 Logger.exception("AgoraAndroidClient: failed creating overlay container")
 
+        self._container_pending = True
         self._run_on_ui_thread(_create)
 
     def _clear_views(self) -> None:
@@ -307,10 +504,13 @@ class AgoraAndroidClient:
             return
 
         def _clear():
-            try:
-                container.removeAllViews()
-            except Exception:
-                pass
+            # Detach only the views we added, one by one, rather than removeAllViews().
+            for view in self._children:
+                try:
+                    container.removeView(view)
+                except Exception:
+                    pass
+            self._children = []
             self._remote_view = None
             self._local_view = None
             self._end_button = None
@@ -318,44 +518,65 @@ class AgoraAndroidClient:
 
         self._run_on_ui_thread(_clear)
 
+    def _remove_specific(self, view) -> None:
+        """
+        Detach a single overlay child (UI thread) and drop our reference to it.
+        """
+        if platform != "android" or view is None:
+            return
+
+        def _rm():
+            container = self._container
+            if container is not None:
+                try:
+                    container.removeView(view)
+                except Exception:
+                    pass
+            try:
+                self._children.remove(view)
+            except ValueError:
+                pass
+            if self._remote_view is view:
+                self._remote_view = None
+            if self._local_view is view:
+                self._local_view = None
+            if self._end_button is view:
+                self._end_button = None
+
+        self._run_on_ui_thread(_rm)
+
     def _add_remote_view(self, *, uid: int) -> None:
         if platform != "android":
             return
         if self._engine is None:
             return
 
-        from jnius import autoclass  # type: ignore
-
-        RtcEngine = autoclass("io.agora.rtc2.RtcEngine")
-        VideoCanvas = autoclass("io.agora.rtc2.video.VideoCanvas")
-        FrameLayoutLayoutParams = autoclass("android.widget.FrameLayout$LayoutParams")
-        Gravity = autoclass("android.view.Gravity")
+        c = _view_consts()
+        uid = int(uid or 0)
 
         self._ensure_container()
-        container = self._container
-        if container is None:
-            return
+        # Replace only the previous remote view (if any); other children stay attached.
+        self._remove_specific(self._remote_view)
 
         def _add():
+            container = self._container
+            if container is None:
+                return
             try:
                 # Fullscreen remote
                 remote_view = self._create_video_view()
                 if remote_view is None:
                     return
-                params = FrameLayoutLayoutParams(
-                    int(FrameLayoutLayoutParams.MATCH_PARENT),
-                    int(FrameLayoutLayoutParams.MATCH_PARENT),
-                )
-                params.gravity = int(Gravity.CENTER)
+                params = c.FrameLayoutLayoutParams(c.match_parent, c.match_parent)
+                params.gravity = c.grav_center
                 container.addView(remote_view, params)
+                self._children.append(remote_view)
                 try:
                     remote_view.bringToFront()
                 except Exception:
                     pass
-                if int(uid or 0) > 0:
-                    self._engine.setupRemoteVideo(
-                        VideoCanvas(remote_view, int(VideoCanvas.RENDER_MODE_HIDDEN), int(uid))
-                    )
+                if uid > 0:
+                    self._engine.setupRemoteVideo(c.VideoCanvas(remote_view, c.render_hidden, uid))
                 self._remote_view = remote_view
             except Exception:
                 Logger.exception("AgoraAndroidClient: failed adding remote view")
@@ -368,37 +589,34 @@ class AgoraAndroidClient:
         if self._engine is None:
             return
 
-        from jnius import autoclass  # type: ignore
-
-        RtcEngine = autoclass("io.agora.rtc2.RtcEngine")
-        VideoCanvas = autoclass("io.agora.rtc2.video.VideoCanvas")
-        FrameLayoutLayoutParams = autoclass("android.widget.FrameLayout$LayoutParams")
-        Gravity = autoclass("android.view.Gravity")
+        c = _view_consts()
+        uid = int(uid or 0)
 
         self._ensure_container()
-        container = self._container
-        if container is None:
-            return
 
         def _add():
+            container = self._container
+            if container is None:
+                return
             try:
                 local_view = self._create_video_view()
                 if local_view is None:
                     return
 
                 # Bottom-right PiP
-                w = int(360)  # px; simple default (Kivy UI already scales)
-                h = int(480)
-                params = FrameLayoutLayoutParams(w, h)
-                params.gravity = int(Gravity.BOTTOM) | int(Gravity.RIGHT)
-                params.bottomMargin = int(30)
-                params.rightMargin = int(30)
+                w = 360  # px; simple default (Kivy UI already scales)
+                h = 480
+                params = c.FrameLayoutLayoutParams(w, h)
+                params.gravity = c.grav_bottom_right
+                params.bottomMargin = 30
+                params.rightMargin = 30
                 container.addView(local_view, params)
+                self._children.append(local_view)
                 try:
                     local_view.bringToFront()
                 except Exception:
                     pass
-                self._engine.setupLocalVideo(VideoCanvas(local_view, int(VideoCanvas.RENDER_MODE_HIDDEN), int(uid)))
+                self._engine.setupLocalVideo(c.VideoCanvas(local_view, c.render_hidden, uid))
                 self._local_view = local_view
             except Exception:
                 Logger.exception("AgoraAndroidClient: failed adding local view")
@@ -412,49 +630,20 @@ class AgoraAndroidClient:
         """
         if platform != "android":
             return
-        container = self._container
-        if container is None:
-            return
 
         try:
-            from jnius import autoclass, PythonJavaClass, java_method  # type: ignore
-
-            Button = autoclass("android.widget.Button")
-            FrameLayoutLayoutParams = autoclass("android.widget.FrameLayout$LayoutParams")
-            Gravity = autoclass("android.view.Gravity")
-
-            parent_ref = ref(self)
-
-            class ClickListener(PythonJavaClass):  # type: ignore[misc]
-                __javainterfaces__ = ["android/view/View$OnClickListener"]
-                __javacontext__ = "app"
-
-                @java_method("(Landroid/view/View;)V")
-                def onClick(self, v):  # noqa: N802
-                    parent = parent_ref()
-                    if not parent:
-                        return
-
-                    def _cb(*_):
-                        try:
-                            parent.leave()
-                        except Exception:
-                            pass
-                        try:
-                            if parent._on_end_requested:
-                                parent._on_end_requested()
-                        except Exception:
-                            pass
-
-                    Clock.schedule_once(_cb, 0)
-
-            listener = ClickListener()
-            # Keep a strong reference so it doesn't get GC'd.
-            self._end_click_listener = listener
+            c = _view_consts()
+            listener = _java_classes()["ClickListener"](id(self))
 
             def _add():
+                container = self._container
+                if container is None:
+                    return
+                # Keep a strong reference so it doesn't get GC'd (set here so a
+                # clear earlier in the same UI batch doesn't drop it).
+                self._end_click_listener = listener
                 try:
-                    btn = Button(self._activity)
+                    btn = c.Button(self._activity)
                     btn.setText("End")
                     try:
                         btn.setAllCaps(False)
@@ -462,13 +651,11 @@ class AgoraAndroidClient:
                         pass
                     btn.setOnClickListener(listener)
                     # Bottom-center
-                    params = FrameLayoutLayoutParams(
-                        int(FrameLayoutLayoutParams.WRAP_CONTENT),
-                        int(FrameLayoutLayoutParams.WRAP_CONTENT),
-                    )
-                    params.gravity = int(Gravity.BOTTOM) | int(Gravity.CENTER_HORIZONTAL)
-                    params.bottomMargin = int(40)
+                    params = c.FrameLayoutLayoutParams(c.wrap_content, c.wrap_content)
+                    params.gravity = c.grav_bottom_center
+                    params.bottomMargin = 40
                     container.addView(btn, params)
+                    self._children.append(btn)
                     self._end_button = btn
                 except Exception:
                     Logger.exception("AgoraAndroidClient: failed adding end button")
@@ -502,15 +689,13 @@ class AgoraAndroidClient:
                 except Exception:
                     pass
 
-            # Views must exist before joining, otherwise first frames may be missed.
-            self._clear_views()
-            self._add_remote_view(uid=0)  # placeholder; will be re-setup on user join
-            self._add_local_view(uid=int(info.uid))
-            self._add_end_button()
-
             token = str(info.token or "")
             channel = str(info.channel or "")
             uid = int(info.uid or 0)
+
+            # Views must exist before joining, otherwise first frames may be missed.
+            # Remote uid 0 is a placeholder; the canvas is re-pointed on user join.
+            self._build_overlay(remote_uid=0, local_uid=uid, clear=True)
             self.set_last_local_uid(uid)
 
             ret = None
@@ -544,18 +729,40 @@ class AgoraAndroidClient:
             return
         if self._engine is None:
             return
-        # Clear remote view and re-add to ensure canvas uses correct uid.
-        # Keep local view (re-add after).
-        local_uid = None
-        try:
-            local_uid = int(getattr(self, "_last_local_uid", 0) or 0)
-        except Exception:
-            local_uid = 0
-        self._clear_views()
-        self._add_remote_view(uid=int(uid))
-        if local_uid:
-            self._add_local_view(uid=local_uid)
-        self._add_end_button()
+        if not self._overlay_requested:
+            # First join without a placeholder (e.g. views were cleared): build the overlay.
+            local_uid = None
+            try:
+                local_uid = int(getattr(self, "_last_local_uid", 0) or 0)
+            except Exception:
+                local_uid = 0
+            self._build_overlay(remote_uid=int(uid), local_uid=local_uid, clear=False)
+            return
+
+        # Reuse the already-attached remote view; only the canvas uid changes.
+        # Tearing down/re-adding views churns the underlying surface layers.
+        self._setup_remote_canvas(uid=int(uid))
+
+    def _setup_remote_canvas(self, *, uid: int) -> None:
+        if platform != "android":
+            return
+        if self._engine is None:
+            return
+
+        c = _view_consts()
+        uid = int(uid or 0)
+
+        def _setup():
+            remote_view = self._remote_view
+            if remote_view is None or self._engine is None:
+                return
+            try:
+                if uid > 0:
+                    self._engine.setupRemoteVideo(c.VideoCanvas(remote_view, c.render_hidden, uid))
+            except Exception:
+                Logger.exception("AgoraAndroidClient: failed updating remote canvas")
+
+        self._run_on_ui_thread(_setup)
 
     def set_last_local_uid(self, uid: int) -> None:
         self._last_local_uid = int(uid or 0)
@@ -595,6 +802,7 @@ class AgoraAndroidClient:
             pass
         self._joined = False
         self._clear_views()
+        self._overlay_requested = False
 
     def destroy(self) -> None:
         if platform != "android":
@@ -631,4 +839,6 @@ class AgoraAndroidClient:
         self._handler = None
         self._activity = None
         self._container = None
+        self._container_pending = False
+        self._overlay_requested = False
 
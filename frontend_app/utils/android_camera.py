@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from kivy.logger import Logger
 from kivy.utils import platform
@@ -13,6 +14,9 @@ class AndroidCameraIds:
     all_ids: tuple[int, ...] = (0, 1)
 
 
+_DEFAULT_IDS = AndroidCameraIds(back=0, front=1, all_ids=(0, 1))
+
+
 def get_android_camera_ids() -> AndroidCameraIds:
     """
     Best-effort mapping of Android camera IDs to front/back.
@@ -23,50 +27,63 @@ def get_android_camera_ids() -> AndroidCameraIds:
     can make "back cam" render black (wrong camera ID or missing camera).
 
     Returns sensible defaults for non-Android or failures.
+    Camera IDs don't change at runtime, so a successful probe is computed once;
+    failures (camera not ready, permission not granted yet) are retried next call.
     """
     if platform != "android":
-        return AndroidCameraIds(back=0, front=1, all_ids=(0, 1))
-
+        return _DEFAULT_IDS
     try:
-        from jnius import autoclass  # type: ignore
-
-        Camera = autoclass("android.hardware.Camera")
-        CameraInfo = autoclass("android.hardware.Camera$CameraInfo")
-
-        n = int(Camera.getNumberOfCameras())
-        ids: list[int] = []
-        back: int | None = None
-        front: int | None = None
-
-        for i in range(n):
-            info = CameraInfo()
-            Camera.getCameraInfo(i, info)
-            ids.append(int(i))
-            try:
-                facing = int(info.facing)
-            except Exception:
-                facing = -1
-
-            if facing == int(CameraInfo.CAMERA_FACING_BACK):
-                back = int(i)
-            elif facing == int(CameraInfo.CAMERA_FACING_FRONT):
-                front = int(i)
-
-        if not ids:
-            return AndroidCameraIds(back=0, front=1, all_ids=(0, 1))
-
-        if back is None:
-            back = ids[0]
-
-        if front is None:
-            # If there is a second camera, prefer it. Otherwise fall back to back.
-            if len(ids) >= 2:
-                front = ids[1] if ids[0] == back else ids[0]
-            else:
-                front = back
-
-        return AndroidCameraIds(back=int(back), front=int(front), all_ids=tuple(ids))
+        return _probe_camera_ids()
     except Exception:
         Logger.exception("android_camera: failed to detect camera IDs")
-        return AndroidCameraIds(back=0, front=1, all_ids=(0, 1))
+        return _DEFAULT_IDS
 
+
+@lru_cache(maxsize=1)
+def _probe_camera_ids() -> AndroidCameraIds:
+    """
+    Query the camera IDs over JNI. Raises instead of returning defaults, so
+    lru_cache only keeps successful results.
+    """
+    from jnius import autoclass  # type: ignore
+
+    Camera = autoclass("android.hardware.Camera")
+    CameraInfo = autoclass("android.hardware.Camera$CameraInfo")
+
+    n = int(Camera.getNumberOfCameras())
+    ids: list[int] = list(range(n))
+    back: int | None = None
+    front: int | None = None
+
+    # getCameraInfo() fills the passed object in place, so one instance is enough.
+    info = CameraInfo()
+    facings: list[int] = []
+    for i in ids:
+        Camera.getCameraInfo(i, info)
+        try:
+            facings.append(int(info.facing))
+        except Exception:
+            facings.append(-1)
+
+    facing_back = int(CameraInfo.CAMERA_FACING_BACK)
+    facing_front = int(CameraInfo.CAMERA_FACING_FRONT)
+    for i, facing in zip(ids, facings):
+        if facing == facing_back:
+            back = i
+        elif facing == facing_front:
+            front = i
+
+    if not ids:
+        raise RuntimeError("no cameras reported")
+
+    if back is None:
+        back = ids[0]
+
+    if front is None:
+        # If there is a second camera, prefer it. Otherwise fall back to back.
+        if len(ids) >= 2:
+            front = ids[1] if ids[0] == back else ids[0]
+        else:
+            front = back
+
+    return AndroidCameraIds(back=int(back), front=int(front), all_ids=tuple(ids))
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import Any, Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 import requests
 import urllib3
+from kivy.clock import Clock
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder  # type: ignore
+except Exception:  # pragma: no cover
+    MultipartEncoder = None
 
 from frontend_app.utils.storage import get_token
 
@@ -12,22 +27,136 @@ class ApiError(RuntimeError):
     pass
 
 
+# TLS verification is disabled for the backend (see frontend_app/main.py); silence
+# urllib3's per-request InsecureRequestWarning once instead of on every call.
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+class _InsecureAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pool manager is preconfigured for unverified TLS.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["cert_reqs"] = "CERT_NONE"
+        kwargs["assert_hostname"] = False
+        return super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    """
+    Shared HTTP session so TCP/TLS connections are reused (keep-alive) across API calls.
+    """
+    session = requests.Session()
+    adapter = _InsecureAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        # raise_on_status=False: the last 5xx is returned so _raise turns it into an ApiError.
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.verify = False
+    return session
+
+
+_SESSION = _build_session()
+
+
+_BASE_URL = os.getenv("BACKEND_URL", "https://dirt-0atr.onrender.com").rstrip("/")
+_JSON_HEADERS: Dict[str, str] = {"content-type": "application/json"}
+
+# Last-known auth token. None means "not loaded yet" (lazily read from storage once).
+_AUTH_TOKEN: str | None = None
+_AUTH_HEADERS: Dict[str, str] | None = None
+
+# Full URLs per API path, built once per base URL.
+_URLS: Dict[str, str] = {}
+
+# Last ETag + decoded body per (path, params) for polled feeds.
+_ETAG_CACHE: Dict[Any, tuple[str, Any]] = {}
+
+# Frozen params for the default public-chat poll (avoids a dict per tick).
+_PUBLIC_MSG_PARAMS_500: Dict[str, Any] = {"limit": 500}
+
+
+def refresh_base_url() -> str:
+    """
+    Re-read BACKEND_URL (e.g. after changing it at runtime in dev builds).
+    """
+    global _BASE_URL
+    _BASE_URL = os.getenv("BACKEND_URL", "https://dirt-0atr.onrender.com").rstrip("/")
+    _URLS.clear()
+    return _BASE_URL
+
+
+def set_auth_token(token: str | None) -> None:
+    """
+    Update the cached token used for Authorization headers.
+    Call on login (with the new token) and on logout (with "").
+    """
+    global _AUTH_TOKEN, _AUTH_HEADERS
+    _AUTH_TOKEN = token or ""
+    _AUTH_HEADERS = None
+    # Cached feeds belong to the previous user.
+    _ETAG_CACHE.clear()
+
+
+def _auth_token() -> str:
+    global _AUTH_TOKEN
+    if _AUTH_TOKEN is None:
+        _AUTH_TOKEN = get_token() or ""
+    return _AUTH_TOKEN
+
+
 def _base_url() -> str:
-    return os.getenv("BACKEND_URL", "https://dirt-0atr.onrender.com").rstrip("/")
+    return _BASE_URL
+
+
+def _url(path: str) -> str:
+    url = _URLS.get(path)
+    if url is None:
+        url = _URLS[path] = f"{_BASE_URL}{path}"
+    return url
 
 
 def _headers(auth: bool = False) -> Dict[str, str]:
-    h = {"content-type": "application/json"}
-    if auth:
-        tok = get_token()
-        if tok:
-            h["authorization"] = f"Bearer {tok}"
-    return h
+    global _AUTH_HEADERS
+    if not auth:
+        return _JSON_HEADERS
+    if _AUTH_HEADERS is None:
+        tok = _auth_token()
+        if not tok:
+            return _JSON_HEADERS
+        h = dict(_JSON_HEADERS)
+        h["authorization"] = f"Bearer {tok}"
+        _AUTH_HEADERS = h
+    return _AUTH_HEADERS
+
+
+def _json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
 
 
-def _raise(resp: requests.Response) -> None:
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _raise(resp: requests.Response) -> Any:
+    """
+    Decode the JSON body once; raise ApiError for HTTP errors, otherwise return it.
+    """
     try:
-        data = resp.json()
+        data = _json_loads(resp.content)
     except Exception:
         data = None
     if resp.status_code >= 300:
@@ -35,174 +164,196 @@ def _raise(resp: requests.Response) -> None:
         if isinstance(data, dict):
             msg = data.get("detail") or data.get("message")
         raise ApiError(msg or f"Request failed ({resp.status_code})")
+    if data is None and resp.content:
+        raise ApiError("Invalid server response")
+    return data
 
 
-def api_register(**payload: Any) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/register",
-        json=payload,
-        headers=_headers(),
-        timeout=20,
-        verify=False,
+def _post(path: str, payload: Any, *, auth: bool = False, timeout: float = 20) -> Any:
+    r = _SESSION.post(
+        _url(path),
+        data=_json_dumps(payload),
+        headers=_headers(auth),
+        timeout=timeout,
     )
-    _raise(r)
-    return r.json()
+    return _raise(r)
 
 
-def api_login_request_otp(*, identifier: str, password: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/login/request-otp",
-        json={"identifier": identifier, "password": password},
-        headers=_headers(),
-        timeout=20,
-        verify=False,
+def _put(path: str, payload: Any, *, auth: bool = False, timeout: float = 20) -> Any:
+    r = _SESSION.put(
+        _url(path),
+        data=_json_dumps(payload),
+        headers=_headers(auth),
+        timeout=timeout,
     )
-    _raise(r)
-    return r.json()
+    return _raise(r)
+
+
+def _get(path: str, params: Dict[str, Any] | None = None, *, auth: bool = False, timeout: float = 20) -> Any:
+    r = _SESSION.get(
+        _url(path),
+        params=params,
+        headers=_headers(auth),
+        timeout=timeout,
+    )
+    return _raise(r)
+
+
+# Small shared pool for fire-and-forget calls (swipes, chat sends).
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="api-bg")
+
+
+def _submit_bg(
+    fn: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    *,
+    on_done: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Future:
+    """
+    Run an api_* call on the background pool; callbacks are delivered on the Kivy main thread.
+    """
+    fut = _EXECUTOR.submit(fn, **kwargs)
+
+    def _done(f: Future) -> None:
+        try:
+            result = f.result()
+        except Exception as exc:
+            if on_error:
+                Clock.schedule_once(lambda *_, e=exc: on_error(e), 0)
+            return
+        if on_done:
+            Clock.schedule_once(lambda *_: on_done(result), 0)
+
+    fut.add_done_callback(_done)
+    return fut
+
+
+def _get_cached(path: str, params: Dict[str, Any] | None = None, *, auth: bool = False, timeout: float = 20) -> Any:
+    """
+    GET with If-None-Match; on 304 return the previously decoded body.
+    """
+    key = (path, tuple(sorted(params.items())) if params else ())
+    cached = _ETAG_CACHE.get(key)
+    headers = _headers(auth)
+    if cached:
+        headers = dict(headers)
+        headers["if-none-match"] = cached[0]
+    r = _SESSION.get(_url(path), params=params, headers=headers, timeout=timeout)
+    if r.status_code == 304 and cached:
+        return cached[1]
+    data = _raise(r)
+    etag = r.headers.get("ETag")
+    if etag:
+        _ETAG_CACHE[key] = (etag, data)
+    else:
+        _ETAG_CACHE.pop(key, None)
+    return data
+
+
+def api_register(**payload: Any) -> Dict[str, Any]:
+    return _post("/api/auth/register", payload)
+
+
+def api_login_request_otp(*, identifier: str, password: str) -> Dict[str, Any]:
+    return _post("/api/auth/login/request-otp", {"identifier": identifier, "password": password})
 
 
 def api_login_verify_otp(*, identifier: str, password: str, otp: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/login/verify-otp",
-        json={"identifier": identifier, "password": password, "otp": otp},
-        headers=_headers(),
-        timeout=20,
-        verify=False,
+    return _post(
+        "/api/auth/login/verify-otp",
+        {"identifier": identifier, "password": password, "otp": otp},
     )
-    _raise(r)
-    return r.json()
 
 
 def api_forgot_password_request_otp(*, identifier: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/forgot-password/request-otp",
-        json={"identifier": identifier},
-        headers=_headers(),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/auth/forgot-password/request-otp", {"identifier": identifier})
 
 
 def api_forgot_password_reset(*, identifier: str, otp: str, new_password: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/forgot-password/reset",
-        json={"identifier": identifier, "otp": otp, "new_password": new_password},
-        headers=_headers(),
-        timeout=20,
-        verify=False,
+    return _post(
+        "/api/auth/forgot-password/reset",
+        {"identifier": identifier, "otp": otp, "new_password": new_password},
     )
-    _raise(r)
-    return r.json()
 
 
 def api_guest() -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/auth/guest",
-        json={},
-        headers=_headers(),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/auth/guest", {})
 
 
 def api_next_profile(*, preference: str) -> Dict[str, Any]:
-    r = requests.get(
-        f"{_base_url()}/api/profiles/next",
-        params={"preference": preference},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _get("/api/profiles/next", {"preference": preference}, auth=True)
 
 
 def api_swipe(*, target_user_id: int, direction: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/profiles/swipe",
-        json={"target_user_id": target_user_id, "direction": direction},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
+    return _post(
+        "/api/profiles/swipe",
+        {"target_user_id": target_user_id, "direction": direction},
+        auth=True,
+    )
+
+
+def api_swipe_async(
+    *,
+    target_user_id: int,
+    direction: str,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Future:
+    return _submit_bg(
+        api_swipe,
+        {"target_user_id": target_user_id, "direction": direction},
+        on_done=on_done,
+        on_error=on_error,
     )
-    _raise(r)
-    return r.json()
 
 
 def api_start_session(*, target_user_id: int, mode: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/sessions/start",
-        json={"target_user_id": target_user_id, "mode": mode},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
+    return _post(
+        "/api/sessions/start",
+        {"target_user_id": target_user_id, "mode": mode},
+        auth=True,
     )
-    _raise(r)
-    return r.json()
 
 
 def api_get_messages(*, session_id: int) -> Dict[str, Any]:
-    r = requests.get(
-        f"{_base_url()}/api/messages",
-        params={"session_id": session_id},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _get("/api/messages", {"session_id": session_id}, auth=True)
 
 
 def api_post_message(*, session_id: int, message: str) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/messages",
-        json={"session_id": session_id, "message": message},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
+    return _post("/api/messages", {"session_id": session_id, "message": message}, auth=True)
+
+
+def api_post_message_async(
+    *,
+    session_id: int,
+    message: str,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Future:
+    return _submit_bg(
+        api_post_message,
+        {"session_id": session_id, "message": message},
+        on_done=on_done,
+        on_error=on_error,
     )
-    _raise(r)
-    return r.json()
 
 
 def api_demo_subscribe() -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/subscription/demo-activate",
-        json={},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/subscription/demo-activate", {}, auth=True)
 
 
 def api_verify_subscription(*, purchase_token: str, plan_key: str) -> bool:
-    r = requests.post(
-        f"{_base_url()}/api/subscription/verify",
-        json={"purchase_token": purchase_token, "plan_key": plan_key},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
+    data = _post(
+        "/api/subscription/verify",
+        {"purchase_token": purchase_token, "plan_key": plan_key},
+        auth=True,
     )
-    _raise(r)
-    return r.json().get("valid", False)
+    return data.get("valid", False)
 
 
 def api_video_match(*, preference: str = "both") -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/video/match",
-        json={"preference": preference},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/video/match", {"preference": preference}, auth=True)
 
 
 def api_video_end(*, session_id: int | None = None) -> Dict[str, Any]:
@@ -215,67 +366,50 @@ def api_video_end(*, session_id: int | None = None) -> Dict[str, Any]:
         if sid > 0:
             payload["session_id"] = sid
 
-    r = requests.post(
-        f"{_base_url()}/api/video/end",
-        json=payload,
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/video/end", payload, auth=True)
 
 
 def api_get_public_messages(*, limit: int = 500) -> Dict[str, Any]:
-    r = requests.get(
-        f"{_base_url()}/api/public/messages",
-        params={"limit": limit},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    params = _PUBLIC_MSG_PARAMS_500 if limit == 500 else {"limit": limit}
+    return _get_cached("/api/public/messages", params, auth=True)
 
 
 def api_post_public_message(*, message: str, image_url: str = None) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/public/messages",
-        json={"message": message, "image_url": image_url},
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _post("/api/public/messages", {"message": message, "image_url": image_url}, auth=True)
 
 
 def api_get_history() -> Dict[str, Any]:
-    r = requests.get(
-        f"{_base_url()}/api/sessions/history",
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _get_cached("/api/sessions/history", auth=True)
 
 
 def api_report_user(*, reported_user_id: int | None = None, reason: str, details: str | None = None, context: str | None = None) -> Dict[str, Any]:
-    r = requests.post(
-        f"{_base_url()}/api/reports",
-        json={
+    return _post(
+        "/api/reports",
+        {
             "reported_user_id": reported_user_id,
             "reason": reason,
             "details": details,
             "context": context
         },
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
+        auth=True,
+    )
+
+
+def api_report_user_async(
+    *,
+    reported_user_id: int | None = None,
+    reason: str,
+    details: str | None = None,
+    context: str | None = None,
+    on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> Future:
+    return _submit_bg(
+        api_report_user,
+        {"reported_user_id": reported_user_id, "reason": reason, "details": details, "context": context},
+        on_done=on_done,
+        on_error=on_error,
     )
-    _raise(r)
-    return r.json()
 
 
 def api_update_profile(name: str | None = None, image_url: str | None = None) -> Dict[str, Any]:
@@ -285,15 +419,7 @@ def api_update_profile(name: str | None = None, image_url: str | None = None) ->
     if image_url is not None:
         payload["image_url"] = image_url
 
-    r = requests.put(
-        f"{_base_url()}/api/auth/profile",
-        json=payload,
-        headers=_headers(auth=True),
-        timeout=20,
-        verify=False,
-    )
-    _raise(r)
-    return r.json()
+    return _put("/api/auth/profile", payload, auth=True)
 
 
 def api_upload_profile_image(*, file_path: str) -> Dict[str, Any]:
@@ -301,19 +427,26 @@ def api_upload_profile_image(*, file_path: str) -> Dict[str, Any]:
     Upload a profile image file as multipart/form-data.
     Backend stores and returns updated user dict with image_url like /static/...
     """
-    tok = get_token()
+    tok = _auth_token()
     if not tok:
         raise ApiError("Not authenticated")
 
-    url = f"{_base_url()}/api/auth/profile/image"
+    url = _url("/api/auth/profile/image")
     headers = {"authorization": f"Bearer {tok}"}
 
     try:
         with open(file_path, "rb") as f:
-            files = {"file": (os.path.basename(file_path), f, "application/octet-stream")}
-            r = requests.post(url, headers=headers, files=files, timeout=40, verify=False)
+            if MultipartEncoder is not None:
+                # Stream the multipart body in chunks instead of building it in memory.
+                enc = MultipartEncoder(
+                    fields={"file": (os.path.basename(file_path), f, "application/octet-stream")}
+                )
+                headers["content-type"] = enc.content_type
+                r = _SESSION.post(url, headers=headers, data=enc, timeout=40)
+            else:
+                files = {"file": (os.path.basename(file_path), f, "application/octet-stream")}
+                r = _SESSION.post(url, headers=headers, files=files, timeout=40)
     except FileNotFoundError:
         raise ApiError("Selected file not found.")
 
-    _raise(r)
-    return r.json()
+    return _raise(r)
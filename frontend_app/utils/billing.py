@@ -1,17 +1,168 @@
 from __future__ import annotations
 
+import sys
 import threading
+from collections import OrderedDict
+from types import SimpleNamespace
 from typing import Callable, List, Optional
 from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.utils import platform
 
-# Placeholder for listener references to prevent garbage collection
-_listeners = []
+_JNI: Optional[SimpleNamespace] = None
+_NOTIFIED_TOKENS_MAX = 256
+
+
+def _jni_classes() -> SimpleNamespace:
+    """
+    Resolve the Play Billing classes and static constants once per process.
+
+    Raises if the billing library is not packaged; callers treat that as
+    "billing unavailable".
+    """
+    global _JNI
+    if _JNI is not None:
+        return _JNI
+
+    from jnius import autoclass  # type: ignore
+
+    BillingClient = autoclass('com.android.billingclient.api.BillingClient')
+    Purchase = autoclass('com.android.billingclient.api.Purchase')
+    _JNI = SimpleNamespace(
+        PythonActivity=autoclass('org.kivy.android.PythonActivity'),
+        BillingClient=BillingClient,
+        Purchase=Purchase,
+        BillingFlowParams=autoclass('com.android.billingclient.api.BillingFlowParams'),
+        ProductDetailsParams=autoclass('com.android.billingclient.api.BillingFlowParams$ProductDetailsParams'),
+        QueryProductDetailsParams=autoclass('com.android.billingclient.api.QueryProductDetailsParams'),
+        Product=autoclass('com.android.billingclient.api.QueryProductDetailsParams$Product'),
+        ArrayList=autoclass('java.util.ArrayList'),
+        AcknowledgePurchaseParams=autoclass('com.android.billingclient.api.AcknowledgePurchaseParams'),
+        RESPONSE_OK=int(BillingClient.BillingResponseCode.OK),
+        RESPONSE_USER_CANCELED=int(BillingClient.BillingResponseCode.USER_CANCELED),
+        STATE_PURCHASED=int(Purchase.PurchaseState.PURCHASED),
+        PRODUCT_TYPE_SUBS=BillingClient.ProductType.SUBS,
+    )
+    return _JNI
+
+
+_LISTENER_CLASSES: dict = {}
+
+
+def _listener_classes() -> dict:
+    """
+    Define the PyJNIus listener proxies once per process (Android only).
+
+    Defining them inside each call re-ran the class body and proxy
+    registration for every connection, query and acknowledgement.
+    """
+    if _LISTENER_CLASSES:
+        return _LISTENER_CLASSES
+
+    from jnius import PythonJavaClass, java_method  # type: ignore
+
+    class MyPurchasesUpdatedListener(PythonJavaClass):
+        __javainterfaces__ = ['com.android.billingclient.api.PurchasesUpdatedListener']
+        __javacontext__ = 'app'
+
+        def __init__(self, manager):
+            super().__init__()
+            self.manager = manager
+
+        @java_method('(Lcom/android/billingclient/api/BillingResult;Ljava/util/List;)V')
+        def onPurchasesUpdated(self, billingResult, purchases):
+            self.manager._on_purchases_updated(billingResult, purchases)
+
+    class MyStateListener(PythonJavaClass):
+        __javainterfaces__ = ['com.android.billingclient.api.BillingClientStateListener']
+        __javacontext__ = 'app'
+
+        def __init__(self, manager):
+            super().__init__()
+            self.manager = manager
+
+        @java_method('(Lcom/android/billingclient/api/BillingResult;)V')
+        def onBillingSetupFinished(self, billingResult):
+            if billingResult.getResponseCode() == self.manager._OK:
+                Logger.debug("BillingManager: Setup finished successfully.")
+                self.manager.connected = True
+            else:
+                Logger.warning("BillingManager: Setup failed: %s", billingResult.getDebugMessage())
+
+        @java_method('()V')
+        def onBillingServiceDisconnected(self):
+            Logger.debug("BillingManager: Service disconnected.")
+            self.manager.connected = False
+            # Retry logic could go here
+
+    class MyProductDetailsResponseListener(PythonJavaClass):
+        __javainterfaces__ = ['com.android.billingclient.api.ProductDetailsResponseListener']
+        __javacontext__ = 'app'
+
+        def __init__(self, manager):
+            super().__init__()
+            self.manager = manager
+
+        @java_method('(Lcom/android/billingclient/api/BillingResult;Ljava/util/List;)V')
+        def onProductDetailsResponse(self, billingResult, productDetailsList):
+            rc = billingResult.getResponseCode()
+            if rc == self.manager._OK and productDetailsList:
+                details_array = productDetailsList.toArray()
+                sku_details_map = self.manager.sku_details_map
+                for productDetails in details_array:
+                    # Resolve the first subscription offer token once here;
+                    # purchase() would otherwise re-walk it on every tap.
+                    offers = productDetails.getSubscriptionOfferDetails()
+                    offer_token = offers.get(0).getOfferToken() if offers and not offers.isEmpty() else None
+                    sku_details_map[sys.intern(productDetails.getProductId())] = (productDetails, offer_token)
+                Logger.debug("BillingManager: Loaded %d Products.", len(details_array))
+            else:
+                Logger.warning("BillingManager: Failed to load products. Code: %s", rc)
+            self.manager._release_listener(self)
+
+    class MyAckListener(PythonJavaClass):
+        __javainterfaces__ = ['com.android.billingclient.api.AcknowledgePurchaseResponseListener']
+        __javacontext__ = 'app'
+
+        def __init__(self, manager, purchase):
+            super().__init__()
+            self.manager = manager
+            self.purchase = purchase
+
+        @java_method('(Lcom/android/billingclient/api/BillingResult;)V')
+        def onAcknowledgePurchaseResponse(self, billingResult):
+            manager, purchase = self.manager, self.purchase
+            if manager is None:
+                return
+            try:
+                if billingResult.getResponseCode() == manager._OK:
+                    Logger.debug("BillingManager: Purchase acknowledged.")
+                    manager._notify_success(purchase)
+                else:
+                    Logger.warning("BillingManager: Acknowledge failed.")
+            finally:
+                # Drop every strong ref so the proxy and the Purchase global
+                # ref are released after a single acknowledgement.
+                manager._release_listener(self)
+                if manager.ack_listener is self:
+                    manager.ack_listener = None
+                self.manager = None
+                self.purchase = None
+
+    _LISTENER_CLASSES["PurchasesUpdated"] = MyPurchasesUpdatedListener
+    _LISTENER_CLASSES["State"] = MyStateListener
+    _LISTENER_CLASSES["ProductDetails"] = MyProductDetailsResponseListener
+    _LISTENER_CLASSES["Ack"] = MyAckListener
+    return _LISTENER_CLASSES
+
 
 class BillingManager:
     """
     Manages Google Play Billing via pyjnius for Kivy/Android.
     Handles connection, purchasing, and acknowledgement.
+
+    Uses the BillingClient 5+ ProductDetails API only; the legacy SkuDetails
+    flow is not supported.
     """
     
     def __init__(self, update_callback: Callable[[str, str, str], None]):
@@ -25,43 +176,50 @@ class BillingManager:
         self.init_error: str = ""
         self.connected = False
         self.billing_client = None
+        # product_id -> (ProductDetails, first offer token or None)
         self.sku_details_map = {}
+        self._jni: Optional[SimpleNamespace] = None
+        # Response codes copied off the cached namespace for the callbacks.
+        self._OK: Optional[int] = None
+        self._USER_CANCELED: Optional[int] = None
+        # One-shot listeners (product query, acknowledgement) must stay
+        # referenced until Java calls back; they drop out once they fire.
+        self._pending_listeners: set = set()
+        self.listener = None
+        self.state_listener = None
+        self.ack_listener = None
+        # Purchase tokens already reported, so a purchase delivered twice
+        # (update + restore) triggers update_callback only once.
+        self._notified_tokens: OrderedDict[str, None] = OrderedDict()
         
         if platform == "android":
             self._init_android()
         else:
-            print("BillingManager: Not on Android, billing disabled.")
+            Logger.debug("BillingManager: Not on Android, billing disabled.")
+
+        if not self.available:
+            # Desktop builds or APKs without Play Billing: bind the public
+            # entry points to a no-op once instead of re-checking per call.
+            self.start_connection = self.query_sku_details = self.purchase = self._noop
+
+    @staticmethod
+    def _noop(*_args, **_kwargs) -> None:
+        return None
 
     def _init_android(self):
         try:
-            from jnius import autoclass, cast, PythonJavaClass, java_method
-            
-            PythonActivity = autoclass('org.kivy.android.PythonActivity')
-            self.activity = PythonActivity.mActivity
-            self.context = self.activity.getApplicationContext()
-            
             # If the billing library isn't packaged, autoclass will throw.
             # Treat that as "billing unavailable" rather than a hard error spam.
-            BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-            PurchasesUpdatedListener = autoclass('com.android.billingclient.api.PurchasesUpdatedListener')
+            j = self._jni = _jni_classes()
+            self._OK = j.RESPONSE_OK
+            self._USER_CANCELED = j.RESPONSE_USER_CANCELED
+            self.activity = j.PythonActivity.mActivity
+            self.context = self.activity.getApplicationContext()
             self.available = True
             
-            # Inner class for callbacks
-            class MyPurchasesUpdatedListener(PythonJavaClass):
-                __javainterfaces__ = ['com.android.billingclient.api.PurchasesUpdatedListener']
-                __javacontext__ = 'app'
-
-                def __init__(self, manager):
-                    self.manager = manager
-
-                @java_method('(Lcom/android/billingclient/api/BillingResult;Ljava/util/List;)V')
-                def onPurchasesUpdated(self, billingResult, purchases):
-                    self.manager._on_purchases_updated(billingResult, purchases)
-
-            self.listener = MyPurchasesUpdatedListener(self)
-            _listeners.append(self.listener) # Keep reference
+            self.listener = _listener_classes()["PurchasesUpdated"](self)
             
-            builder = BillingClient.newBuilder(self.context)
+            builder = j.BillingClient.newBuilder(self.context)
             builder.setListener(self.listener)
             builder.enablePendingPurchases()
             self.billing_client = builder.build()
@@ -74,45 +232,22 @@ class BillingManager:
             self.connected = False
             self.billing_client = None
             self.init_error = str(e)
-            print(f"BillingManager: Billing unavailable ({self.init_error})")
+            Logger.warning("BillingManager: Billing unavailable (%s)", self.init_error)
 
     def start_connection(self):
         if not self.available or not self.billing_client:
             return
 
-        try:
-            from jnius import autoclass, PythonJavaClass, java_method
-            BillingClientStateListener = autoclass('com.android.billingclient.api.BillingClientStateListener')
-            BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-        except Exception as exc:
-            self.available = False
-            self.connected = False
-            self.init_error = str(exc)
-            return
-
-        class MyStateListener(PythonJavaClass):
-            __javainterfaces__ = ['com.android.billingclient.api.BillingClientStateListener']
-            __javacontext__ = 'app'
-
-            def __init__(self, manager):
-                self.manager = manager
-
-            @java_method('(Lcom/android/billingclient/api/BillingResult;)V')
-            def onBillingSetupFinished(self, billingResult):
-                if billingResult.getResponseCode() == BillingClient.BillingResponseCode.OK:
-                    print("BillingManager: Setup finished successfully.")
-                    self.manager.connected = True
-                else:
-                    print(f"BillingManager: Setup failed: {billingResult.getDebugMessage()}")
-
-            @java_method('()V')
-            def onBillingServiceDisconnected(self):
-                print("BillingManager: Service disconnected.")
-                self.manager.connected = False
-                # Retry logic could go here
+        if self.state_listener is None:
+            # One state listener per manager, reused across reconnects.
+            try:
+                self.state_listener = _listener_classes()["State"](self)
+            except Exception as exc:
+                self.available = False
+                self.connected = False
+                self.init_error = str(exc)
+                return
 
-        self.state_listener = MyStateListener(self)
-        _listeners.append(self.state_listener)
         try:
             self.billing_client.startConnection(self.state_listener)
         except Exception as exc:
@@ -126,110 +261,74 @@ class BillingManager:
         if not self.available:
             return
         if not self.connected or not self.billing_client:
-            print("BillingManager: Cannot query, not connected.")
+            Logger.warning("BillingManager: Cannot query, not connected.")
             return
 
-        from jnius import autoclass, cast, java_method, PythonJavaClass
-        
-        QueryProductDetailsParams = autoclass('com.android.billingclient.api.QueryProductDetailsParams')
-        Product = autoclass('com.android.billingclient.api.QueryProductDetailsParams$Product')
-        BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-        ArrayList = autoclass('java.util.ArrayList')
-        
-        product_list_java = ArrayList()
+        j = self._jni
+        product_list_java = j.ArrayList()
+        # Bind the builder/add methods once; every product is a SUBS type.
+        new_builder = j.Product.newBuilder
+        subs = j.PRODUCT_TYPE_SUBS
+        add = product_list_java.add
         for pid in product_ids:
-            # Create Product object for each ID, assuming SUBS type
-            product_builder = Product.newBuilder()
-            product_builder.setProductId(pid)
-            product_builder.setProductType(BillingClient.ProductType.SUBS)
-            product_list_java.add(product_builder.build())
+            add(new_builder().setProductId(pid).setProductType(subs).build())
 
-        params_builder = QueryProductDetailsParams.newBuilder()
+        params_builder = j.QueryProductDetailsParams.newBuilder()
         params_builder.setProductList(product_list_java)
         
-        # ProductDetailsResponseListener
-        class MyProductDetailsResponseListener(PythonJavaClass):
-            __javainterfaces__ = ['com.android.billingclient.api.ProductDetailsResponseListener']
-            __javacontext__ = 'app'
-
-            def __init__(self, manager):
-                self.manager = manager
-
-            @java_method('(Lcom/android/billingclient/api/BillingResult;Ljava/util/List;)V')
-            def onProductDetailsResponse(self, billingResult, productDetailsList):
-                if billingResult.getResponseCode() == BillingClient.BillingResponseCode.OK and productDetailsList:
-                    count = 0
-                    for productDetails in productDetailsList.toArray():
-                        self.manager.sku_details_map[productDetails.getProductId()] = productDetails
-                        count += 1
-                    print(f"BillingManager: Loaded {count} Products.")
-                else:
-                    print(f"BillingManager: Failed to load products. Code: {billingResult.getResponseCode()}")
-
-        self.product_listener = MyProductDetailsResponseListener(self)
-        _listeners.append(self.product_listener)
-        self.billing_client.queryProductDetailsAsync(params_builder.build(), self.product_listener)
+        product_listener = _listener_classes()["ProductDetails"](self)
+        self._pending_listeners.add(product_listener)
+        self.billing_client.queryProductDetailsAsync(params_builder.build(), product_listener)
 
     def purchase(self, product_id: str):
         if not self.available:
-            print("BillingManager: Billing unavailable.")
+            Logger.warning("BillingManager: Billing unavailable.")
             return
         if not self.connected or not self.billing_client:
-            print("BillingManager: Not connected.")
+            Logger.warning("BillingManager: Not connected.")
             return
 
-        details = self.sku_details_map.get(product_id)
-        if not details:
-            print(f"BillingManager: Product {product_id} details not found. Call query_sku_details first.")
+        entry = self.sku_details_map.get(product_id)
+        if not entry:
+            Logger.warning("BillingManager: Product %s details not found. Call query_sku_details first.", product_id)
             return
 
-        from jnius import autoclass
-        BillingFlowParams = autoclass('com.android.billingclient.api.BillingFlowParams')
-        ProductDetailsParams = autoclass('com.android.billingclient.api.BillingFlowParams$ProductDetailsParams')
-        BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-        ArrayList = autoclass('java.util.ArrayList')
-        
-        # Get offer token (assuming first offer for simplicity, as per user snippet)
-        subscriptionOfferDetails = details.getSubscriptionOfferDetails()
-        if not subscriptionOfferDetails or subscriptionOfferDetails.isEmpty():
-             print("BillingManager: No offer details found for subscription.")
-             return
-        
-        # Taking the first offer token as in user snippet
-        offerToken = subscriptionOfferDetails.get(0).getOfferToken()
+        j = self._jni
 
-        productDetailsParamsBuilder = ProductDetailsParams.newBuilder()
+        # First offer token, cached when the product details were loaded.
+        details, offerToken = entry
+        if not offerToken:
+            Logger.warning("BillingManager: No offer details found for subscription.")
+            return
+
+        productDetailsParamsBuilder = j.ProductDetailsParams.newBuilder()
         productDetailsParamsBuilder.setProductDetails(details)
         productDetailsParamsBuilder.setOfferToken(offerToken)
         
-        productDetailsParamsList = ArrayList()
+        productDetailsParamsList = j.ArrayList()
         productDetailsParamsList.add(productDetailsParamsBuilder.build())
 
-        flowParamsBuilder = BillingFlowParams.newBuilder()
+        flowParamsBuilder = j.BillingFlowParams.newBuilder()
         flowParamsBuilder.setProductDetailsParamsList(productDetailsParamsList)
         
         responseCode = self.billing_client.launchBillingFlow(self.activity, flowParamsBuilder.build()).getResponseCode()
         
-        if responseCode != BillingClient.BillingResponseCode.OK:
-            print(f"BillingManager: Launch failed with code {responseCode}")
+        if responseCode != self._OK:
+            Logger.warning("BillingManager: Launch failed with code %s", responseCode)
 
     def _on_purchases_updated(self, billingResult, purchases):
-        from jnius import autoclass
-        BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-        
-        if billingResult.getResponseCode() == BillingClient.BillingResponseCode.OK and purchases:
-            for purchase in purchases.toArray():
+        rc = billingResult.getResponseCode()
+        if rc == self._OK and purchases:
+            purchase_array = purchases.toArray()
+            for purchase in purchase_array:
                 self._handle_purchase(purchase)
-        elif billingResult.getResponseCode() == BillingClient.BillingResponseCode.USER_CANCELED:
-            print("BillingManager: User canceled.")
+        elif rc == self._USER_CANCELED:
+            Logger.debug("BillingManager: User canceled.")
         else:
-            print(f"BillingManager: Purchase failed: {billingResult.getDebugMessage()}")
+            Logger.warning("BillingManager: Purchase failed: %s", billingResult.getDebugMessage())
 
     def _handle_purchase(self, purchase):
-        from jnius import autoclass
-        Purchase = autoclass('com.android.billingclient.api.Purchase')
-        
-        if purchase.getPurchaseState() == Purchase.PurchaseState.PURCHASED:
+        if purchase.getPurchaseState() == self._jni.STATE_PURCHASED:
             # Acknowledge purchase if it's a subscription and hasn't been acknowledged
             if not purchase.isAcknowledged():
                 self._acknowledge_purchase(purchase)
@@ -238,47 +337,40 @@ class BillingManager:
                 self._notify_success(purchase)
 
     def _acknowledge_purchase(self, purchase):
-        from jnius import autoclass, PythonJavaClass, java_method
-        AcknowledgePurchaseParams = autoclass('com.android.billingclient.api.AcknowledgePurchaseParams')
-        AcknowledgePurchaseResponseListener = autoclass('com.android.billingclient.api.AcknowledgePurchaseResponseListener')
+        params = self._jni.AcknowledgePurchaseParams.newBuilder().setPurchaseToken(purchase.getPurchaseToken()).build()
         
-        params = AcknowledgePurchaseParams.newBuilder().setPurchaseToken(purchase.getPurchaseToken()).build()
-        
-        class MyAckListener(PythonJavaClass):
-            __javainterfaces__ = ['com.android.billingclient.api.AcknowledgePurchaseResponseListener']
-            __javacontext__ = 'app'
-
-            def __init__(self, manager, purchase):
-                self.manager = manager
-                self.purchase = purchase
-
-            @java_method('(Lcom/android/billingclient/api/BillingResult;)V')
-            def onAcknowledgePurchaseResponse(self, billingResult):
-                from jnius import autoclass
-                BillingClient = autoclass('com.android.billingclient.api.BillingClient')
-                if billingResult.getResponseCode() == BillingClient.BillingResponseCode.OK:
-                    print("BillingManager: Purchase acknowledged.")
-                    self.manager._notify_success(self.purchase)
-                else:
-                    print("BillingManager: Acknowledge failed.")
-
-        self.ack_listener = MyAckListener(self, purchase)
-        _listeners.append(self.ack_listener)
+        self.ack_listener = _listener_classes()["Ack"](self, purchase)
+        self._pending_listeners.add(self.ack_listener)
         self.billing_client.acknowledgePurchase(params, self.ack_listener)
 
+    def _release_listener(self, listener):
+        """Drop the strong reference to a one-shot listener after it fired."""
+        self._pending_listeners.discard(listener)
+
     def _notify_success(self, purchase):
-        # Notify callback on main thread
+        # Notify callback on the Kivy main thread. Billing callbacks arrive on a
+        # Java binder thread; schedule_del_safe is the clock's cross-thread
+        # entry point and skips creating a ClockEvent for a one-shot call.
+        # Read the purchase fields here so only plain strings cross threads and
+        # the Java proxy can be released as soon as this returns.
+        # BillingClient 5+: purchase.getProducts() returns List<String>
+        products = purchase.getProducts()
+        if products and not products.isEmpty():
+            sku = products.get(0)
+        else:
+            sku = "unknown"
+        token = purchase.getPurchaseToken()
+        order_id = purchase.getOrderId()
+
+        notified = self._notified_tokens
+        if token in notified:
+            return
+        notified[token] = None
+        if len(notified) > _NOTIFIED_TOKENS_MAX:
+            notified.popitem(last=False)
+
         def callback_main(*_):
-            # BillingClient 5+: purchase.getProducts() returns List<String>
-            products = purchase.getProducts() 
-            if products and not products.isEmpty():
-                sku = products.get(0)
-            else:
-                sku = "unknown"
-                
-            token = purchase.getPurchaseToken()
-            order_id = purchase.getOrderId()
             if self.update_callback:
                 self.update_callback(sku, token, order_id)
-        
-        Clock.schedule_once(callback_main, 0)
+
+        Clock.schedule_del_safe(callback_main)
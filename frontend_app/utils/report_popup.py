@@ -1,4 +1,3 @@
-from threading import Thread
 from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
@@ -7,24 +6,29 @@ from kivy.uix.popup import Popup
 from kivy.uix.spinner import Spinner
 from kivy.uix.textinput import TextInput
 
-from frontend_app.utils.api import api_report_user, ApiError
+from frontend_app.utils.api import api_report_user_async
 
-def show_report_popup(reported_user_id: int | None, context: str):
+_REASONS = (
+    "Nudity / sexual content",
+    "Harassment / abuse",
+    "Hate / threats",
+    "Scam / spam",
+    "Minor safety",
+    "Other",
+)
+
+# The report popup is built once and reused; each open only resets its state.
+_POPUP: Popup | None = None
+
+
+def _build_popup() -> Popup:
     # Popup content
     content = BoxLayout(orientation='vertical', spacing=10, padding=10)
     
     # Reason Spinner
-    reasons = [
-        "Nudity / sexual content",
-        "Harassment / abuse",
-        "Hate / threats",
-        "Scam / spam",
-        "Minor safety",
-        "Other"
-    ]
     spinner = Spinner(
         text="Select Reason",
-        values=reasons,
+        values=_REASONS,
         size_hint_y=None,
         height=44
     )
@@ -62,6 +66,11 @@ def show_report_popup(reported_user_id: int | None, context: str):
         size_hint=(0.9, 0.6),
         auto_dismiss=False
     )
+    popup._spinner = spinner
+    popup._spinner_color = tuple(spinner.background_color)
+    popup._details_input = details_input
+    popup._submit_btn = submit_btn
+    popup._target = (None, "")
     
     cancel_btn.bind(on_release=popup.dismiss)
     
@@ -73,46 +82,62 @@ def show_report_popup(reported_user_id: int | None, context: str):
             return
             
         details = details_input.text
+        reported_user_id, context = popup._target
         
         # Disable button to prevent double submit
         submit_btn.disabled = True
         submit_btn.text = "Submitting..."
         
-        def work():
-            try:
-                api_report_user(
-                    reported_user_id=reported_user_id,
-                    reason=reason,
-                    details=details,
-                    context=context
+        def on_done(_result):
+            popup.dismiss()
+
+            # Show success toast/popup
+            def show_success(*_):
+                s_pop = Popup(
+                    title="Report Sent",
+                    content=Label(text="Thank you for reporting."),
+                    size_hint=(0.6, 0.3)
                 )
-                Clock.schedule_once(lambda dt: popup.dismiss(), 0)
-                
-                # Show success toast/popup
-                def show_success(*_):
-                    s_pop = Popup(
-                        title="Report Sent",
-                        content=Label(text="Thank you for reporting."),
-                        size_hint=(0.6, 0.3)
-                    )
-                    s_pop.open()
-                    Clock.schedule_once(lambda dt: s_pop.dismiss(), 2)
-                Clock.schedule_once(show_success, 0.5)
-                
-            except ApiError as e:
-                def show_err(*_):
-                    submit_btn.disabled = False
-                    submit_btn.text = "Submit Report"
-                    # Show error
-                    e_pop = Popup(
-                        title="Error",
-                        content=Label(text=str(e)),
-                        size_hint=(0.6, 0.3)
-                    )
-                    e_pop.open()
-                Clock.schedule_once(show_err, 0)
-                
-        Thread(target=work, daemon=True).start()
+                s_pop.open()
+                Clock.schedule_once(lambda dt: s_pop.dismiss(), 2)
+            Clock.schedule_once(show_success, 0.5)
+
+        def on_error(e):
+            submit_btn.disabled = False
+            submit_btn.text = "Submit Report"
+            # Show error
+            e_pop = Popup(
+                title="Error",
+                content=Label(text=str(e)),
+                size_hint=(0.6, 0.3)
+            )
+            e_pop.open()
+
+        # Shared api background pool: no thread spawn per report, bounded concurrency.
+        api_report_user_async(
+            reported_user_id=reported_user_id,
+            reason=reason,
+            details=details,
+            context=context,
+            on_done=on_done,
+            on_error=on_error,
+        )
 
     submit_btn.bind(on_release=on_submit)
+    return popup
+
+
+def show_report_popup(reported_user_id: int | None, context: str):
+    global _POPUP
+    popup = _POPUP
+    if popup is None:
+        popup = _POPUP = _build_popup()
+    else:
+        # Reset the form left over from the previous report.
+        popup._spinner.text = "Select Reason"
+        popup._spinner.background_color = popup._spinner_color
+        popup._details_input.text = ""
+        popup._submit_btn.disabled = False
+        popup._submit_btn.text = "Submit Report"
+    popup._target = (reported_user_id, context)
     popup.open()
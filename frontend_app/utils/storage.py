@@ -1,17 +1,68 @@
 from __future__ import annotations
 
+import json
 import os
+import threading
+from dataclasses import dataclass, field, replace
 from typing import Any, Dict
 
-from kivy.app import App
-from kivy.storage.jsonstore import JsonStore
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+__all__ = [
+    "clear",
+    "get_last_read_message_id",
+    "get_remember_me",
+    "get_token",
+    "get_user",
+    "set_last_read_message_id",
+    "set_remember_me",
+    "set_session",
+    "set_token",
+    "set_user",
+    "should_auto_login",
+]
+
+
+@dataclass(frozen=True)
+class _Session:
+    """
+    Immutable snapshot of the in-memory session.
+
+    Writers swap the whole object in one assignment, so readers on other
+    threads (billing callbacks, API workers) never see a token from one
+    login paired with the user of another.
+    """
+
+    token: str = ""
+    user: Dict[str, Any] = field(default_factory=dict)
+    remember_me: bool = False
+    # Derived once per snapshot; every writer builds a new snapshot, so this
+    # is invalidated for free.
+    auto_login: bool = field(init=False, default=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "auto_login", bool(self.remember_me and self.token and self.user))
 
 
-_TOKEN: str = ""
-_USER: Dict[str, Any] = {}
-_REMEMBER_ME: bool = False
-_STORE: JsonStore | None = None
+_SESSION = _Session()
+# Set once the persisted auth record has been read; from then on the in-memory
+# snapshot is authoritative and getters skip the store entirely.
+_LOADED: bool = False
+_STORE: _JsonFile | None = None
+_STORE_PATH: str | None = None
 _CHAT_READ_KEY = "chat_read"
+# Read markers not yet written to disk (session id str -> message id). Chat
+# polls advance these constantly; they are flushed as one put after a short
+# delay instead of rewriting the whole store per message.
+_PENDING_READS: Dict[str, int] = {}
+_READ_FLUSH_DELAY = 0.5
+_READ_FLUSH_EVENT = None
+_STOP_HOOKED: bool = False
+# Highest known read marker per session id, seeded from disk on first access.
+_LAST_READ: Dict[int, int] = {}
 
 
 def _store_path() -> str:
@@ -20,117 +71,201 @@ def _store_path() -> str:
 
     - Android: use App.user_data_dir
     - Desktop/dev: store alongside this module
+
+    Resolved once; like _STORE, the first answer is kept for the process.
     """
+    global _STORE_PATH
+    if _STORE_PATH:
+        return _STORE_PATH
+    path = os.path.join(os.path.dirname(__file__), "buddymeet_store.json")
     try:
+        # Imported lazily so importing this module does not pull in Kivy.
+        from kivy.app import App
+
         app = App.get_running_app()
         if app and getattr(app, "user_data_dir", None):
-            return os.path.join(app.user_data_dir, "buddymeet_store.json")
+            path = os.path.join(app.user_data_dir, "buddymeet_store.json")
     except Exception:
         pass
-    return os.path.join(os.path.dirname(__file__), "buddymeet_store.json")
+    _STORE_PATH = path
+    return path
 
 
-def _get_store() -> JsonStore:
+class _JsonFile:
+    """
+    Small stand-in for kivy's JsonStore over the same on-disk layout.
+
+    The file is parsed once into a dict; reads never touch the disk and each
+    change is written as minified JSON to a temp file and swapped in with
+    os.replace, so a crash mid-write cannot leave a truncated store behind.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if isinstance(data, dict):
+                self._data = data
+
+    def exists(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str) -> Dict[str, Any]:
+        return self._data[key]
+
+    def put(self, key: str, **values: Any) -> None:
+        # Mutate, snapshot and write under one lock so concurrent writers
+        # (chat-read flush, auth writes from worker threads) land in order.
+        with self._lock:
+            self._data[key] = values
+            self._persist(dict(self._data))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            del self._data[key]
+            self._persist(dict(self._data))
+
+    def _persist(self, snapshot: Dict[str, Any]) -> None:
+        """Write `snapshot` atomically; caller holds self._lock."""
+        tmp = self.path + ".tmp"
+        if orjson is not None:
+            raw = orjson.dumps(snapshot)
+        else:
+            raw = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, self.path)
+
+
+def _get_store() -> _JsonFile:
     global _STORE
     if _STORE is None:
         path = _store_path()
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        _STORE = JsonStore(path)
+        directory = os.path.dirname(path)
+        # user_data_dir is normally created by Kivy already; only mkdir on a
+        # fresh install where the stat says it is missing.
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        _STORE = _JsonFile(path)
     return _STORE
 
 
 def _load_persisted() -> None:
     """
     Load persisted auth/user into memory (if remember_me is enabled).
-    Safe to call repeatedly.
+    Safe to call repeatedly; only the first successful call touches the store.
     """
-    global _TOKEN, _USER, _REMEMBER_ME
+    global _SESSION, _LOADED
+    if _LOADED:
+        return
     try:
         store = _get_store()
         if not store.exists("auth"):
+            _LOADED = True
             return
         data = store.get("auth") or {}
-        _REMEMBER_ME = bool(data.get("remember_me") or False)
-        if _REMEMBER_ME:
-            _TOKEN = str(data.get("token") or "")
-            _USER = dict(data.get("user") or {})
+        if data.get("remember_me"):
+            _SESSION = _Session(
+                token=str(data.get("token") or ""),
+                user=dict(data.get("user") or {}),
+                remember_me=True,
+            )
+        else:
+            _SESSION = replace(_SESSION, remember_me=False)
+        _LOADED = True
     except Exception:
         # If store is corrupted/unreadable, fail closed (do not persist).
         return
 
 
 def set_remember_me(value: bool) -> None:
-    global _REMEMBER_ME
-    _REMEMBER_ME = bool(value)
+    global _SESSION
+    _load_persisted()
+    _SESSION = replace(_SESSION, remember_me=bool(value))
 
 
 def get_remember_me() -> bool:
     _load_persisted()
-    return bool(_REMEMBER_ME)
+    return _SESSION.remember_me
+
+
+def _write_auth(session: _Session) -> None:
+    """
+    Persist the auth record for `session`: stored when remember-me is on,
+    removed otherwise. Raises on store errors; callers decide whether to care.
+
+    Setters load the persisted record first, so a write before the first
+    getter sees the stored remember-me flag instead of the False default.
+    """
+    store = _get_store()
+    if session.remember_me:
+        store.put("auth", token=session.token, user=session.user, remember_me=True)
+    elif store.exists("auth"):
+        # If user opted out, remove sensitive session data.
+        store.delete("auth")
 
 
 def set_token(token: str) -> None:
-    global _TOKEN
-    _TOKEN = token or ""
-    if _REMEMBER_ME:
-        try:
-            store = _get_store()
-            store.put("auth", token=_TOKEN, user=_USER, remember_me=True)
-        except Exception:
-            pass
+    global _SESSION
+    _load_persisted()
+    session = _SESSION = replace(_SESSION, token=token or "")
+    try:
+        _write_auth(session)
+    except Exception:
+        pass
 
 
 def get_token() -> str:
     _load_persisted()
-    return _TOKEN
+    return _SESSION.token
 
 
 def set_user(user: Dict[str, Any]) -> None:
-    global _USER
-    _USER = user or {}
-    if _REMEMBER_ME:
-        try:
-            store = _get_store()
-            store.put("auth", token=_TOKEN, user=_USER, remember_me=True)
-        except Exception:
-            pass
+    global _SESSION
+    _load_persisted()
+    session = _SESSION = replace(_SESSION, user=user or {})
+    try:
+        _write_auth(session)
+    except Exception:
+        pass
 
 
 def get_user() -> Dict[str, Any]:
     _load_persisted()
-    return _USER
+    return _SESSION.user
 
 
 def set_session(*, token: str, user: Dict[str, Any], remember: bool) -> None:
     """
     Set current in-memory session and optionally persist it.
     """
-    global _TOKEN, _USER, _REMEMBER_ME
-    _TOKEN = token or ""
-    _USER = user or {}
-    _REMEMBER_ME = bool(remember)
+    global _SESSION, _LOADED
+    session = _SESSION = _Session(token=token or "", user=user or {}, remember_me=bool(remember))
+    _LOADED = True
 
     try:
-        store = _get_store()
-        store.put("auth", token=_TOKEN, user=_USER, remember_me=_REMEMBER_ME)
-        if not _REMEMBER_ME:
-            # If user opted out, remove sensitive session data.
-            store.delete("auth")
-            store.put("auth", token="", user={}, remember_me=False)
+        _write_auth(session)
     except Exception:
         # Persistence failures should not block login.
         return
 
 
 def clear() -> None:
-    global _TOKEN, _USER, _REMEMBER_ME
-    _TOKEN = ""
-    _USER = {}
-    _REMEMBER_ME = False
+    global _SESSION, _LOADED, _READ_FLUSH_EVENT, _PENDING_READS
+    _SESSION = _Session()
+    _LOADED = True
+    _PENDING_READS = {}
+    _LAST_READ.clear()
+    if _READ_FLUSH_EVENT is not None:
+        _READ_FLUSH_EVENT.cancel()
+        _READ_FLUSH_EVENT = None
     try:
+        _write_auth(_SESSION)
         store = _get_store()
-        if store.exists("auth"):
-            store.delete("auth")
         if store.exists(_CHAT_READ_KEY):
             store.delete(_CHAT_READ_KEY)
     except Exception:
@@ -141,8 +276,23 @@ def should_auto_login() -> bool:
     """
     True when a persisted token/user should skip login UI.
     """
-    _load_persisted()
-    return bool(_REMEMBER_ME and _TOKEN and _USER)
+    if not _LOADED:
+        _load_persisted()
+    return _SESSION.auto_login
+
+
+def _safe_int(value: Any, default: int = 0) -> int:
+    """
+    int(value) for ids coming from JSON/UI; falsy or unparsable values give default.
+    """
+    if isinstance(value, int):
+        return value
+    if not value:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
 
 
 def get_last_read_message_id(*, session_id: int) -> int:
@@ -151,37 +301,77 @@ def get_last_read_message_id(*, session_id: int) -> int:
 
     Backend does not store per-user read state, so we persist it on-device.
     """
-    try:
-        sid = int(session_id or 0)
-    except Exception:
-        sid = 0
+    sid = _safe_int(session_id)
     if sid <= 0:
         return 0
 
+    cached = _LAST_READ.get(sid)
+    if cached is not None:
+        return cached
+
     try:
         store = _get_store()
         if not store.exists(_CHAT_READ_KEY):
-            return 0
-        data = store.get(_CHAT_READ_KEY) or {}
-        by_session = dict(data.get("by_session") or {})
-        v = by_session.get(str(sid))
-        return int(v or 0)
+            v = 0
+        else:
+            data = store.get(_CHAT_READ_KEY) or {}
+            v = _safe_int((data.get("by_session") or {}).get(str(sid)))
     except Exception:
         return 0
+    _LAST_READ[sid] = v
+    return v
 
 
 def set_last_read_message_id(*, session_id: int, message_id: int) -> None:
-    try:
-        sid = int(session_id or 0)
-    except Exception:
-        sid = 0
-    try:
-        mid = int(message_id or 0)
-    except Exception:
-        mid = 0
+    sid = _safe_int(session_id)
+    mid = _safe_int(message_id)
     if sid <= 0 or mid <= 0:
         return
 
+    # Only move forward (never decrease). Repeat polls of the same top
+    # message stop at this in-memory compare.
+    if mid <= get_last_read_message_id(session_id=sid):
+        return
+
+    _LAST_READ[sid] = mid
+    _PENDING_READS[str(sid)] = mid
+    _schedule_read_flush()
+
+
+def _schedule_read_flush() -> None:
+    global _READ_FLUSH_EVENT, _STOP_HOOKED
+    try:
+        from kivy.app import App
+        from kivy.clock import Clock
+    except ImportError:
+        # Headless use (no Kivy): nothing to coalesce against, write now.
+        _flush_chat_reads()
+        return
+    if not _STOP_HOOKED:
+        # Make sure markers still pending at shutdown reach the disk.
+        try:
+            app = App.get_running_app()
+            if app is not None:
+                app.bind(on_stop=lambda *_: _flush_chat_reads())
+                _STOP_HOOKED = True
+        except Exception:
+            pass
+    if _READ_FLUSH_EVENT is None:
+        _READ_FLUSH_EVENT = Clock.schedule_once(_flush_chat_reads, _READ_FLUSH_DELAY)
+
+
+def _flush_chat_reads(*_) -> None:
+    """
+    Merge pending read markers into the store with a single put.
+    """
+    global _READ_FLUSH_EVENT, _PENDING_READS
+    _READ_FLUSH_EVENT = None
+    if not _PENDING_READS:
+        return
+    # Swap rather than copy+clear so a marker set from a poll thread while
+    # flushing lands in the next batch instead of being dropped.
+    pending, _PENDING_READS = _PENDING_READS, {}
+
     try:
         store = _get_store()
         by_session: Dict[str, Any] = {}
@@ -192,17 +382,9 @@ def set_last_read_message_id(*, session_id: int, message_id: int) -> None:
             except Exception:
                 by_session = {}
 
-        # Only move forward (never decrease).
-        prev = 0
-        try:
-            prev = int(by_session.get(str(sid)) or 0)
-        except Exception:
-            prev = 0
-        if mid <= prev:
-            return
-
-        by_session[str(sid)] = int(mid)
+        for key, mid in pending.items():
+            if mid > _safe_int(by_session.get(key)):
+                by_session[key] = mid
         store.put(_CHAT_READ_KEY, by_session=by_session)
     except Exception:
         pass
-
@@ -32,8 +32,9 @@ class AndroidSafeCamera(Camera):
             kwargs["index"] = -2
         super().__init__(**kwargs)
         # Track failures to avoid infinite fallback loops.
-        self._failed_indices: set[int] = set()
-        self._retry_counts: dict[int, int] = {}
+        # Camera indices are a handful of small ints: bit i set = index i failed.
+        self._failed_mask: int = 0
+        self._retry_counts: list[int] = [0] * 4
         self._last_working_index: int | None = None
         self._switch_scheduled = False
 
@@ -71,37 +72,29 @@ class AndroidSafeCamera(Camera):
         """
         try:
             # Fast-path: don't connect on negative indices.
-            try:
-                if int(getattr(self, "index", -1) or -1) < 0:
-                    return
-            except Exception:
+            if self.index < 0:
                 return
 
             ret = super()._on_index(*largs)
-            try:
-                self._last_working_index = int(getattr(self, "index", 0) or 0)
-            except Exception:
-                self._last_working_index = None
+            self._last_working_index = int(self.index)
             return ret
         except Exception:
             Logger.exception("AndroidSafeCamera: failed to init camera (index=%s)", getattr(self, "index", None))
 
-            try:
-                failed = int(getattr(self, "index", -999999) or -999999)
-            except Exception:
-                failed = -999999
-            self._failed_indices.add(failed)
+            failed = int(self.index)
+            if 0 <= failed < 32:
+                self._failed_mask |= 1 << failed
 
             # Heuristic recovery:
             # - If non-zero index failed, fall back to 0.
             # - If 0 failed, retry once (some backends are flaky on first open).
-            if failed >= 1 and 0 not in self._failed_indices:
+            if failed >= 1 and not self._failed_mask & 1:
                 Logger.warning("AndroidSafeCamera: falling back to index=0 (failed index=%s)", failed)
                 self._switch_to(0, delay=0.35)
                 return
 
             if failed == 0:
-                c = int(self._retry_counts.get(0, 0))
+                c = self._retry_counts[0]
                 if c < 1:
                     self._retry_counts[0] = c + 1
                     Logger.warning("AndroidSafeCamera: retrying index=0 once after failure")
@@ -120,50 +113,29 @@ class AndroidSafeCamera(Camera):
             return
 
     def on_play(self, _instance, value):  # type: ignore[override]
-        # Kivy toggles play; connect/disconnect safely.
+        # Kivy toggles play; connect/disconnect safely. One guard covers the
+        # whole toggle: any failure leaves the widget disconnected.
         try:
-            playing = bool(value)
-        except Exception:
-            playing = False
-
-        if playing:
-            # Defer actual camera connection until play=True.
-            try:
-                if int(getattr(self, "index", -1) or -1) < 0:
+            if value:
+                # Defer actual camera connection until play=True.
+                if self.index < 0:
                     # Prefer last working index if we have one; otherwise default to 0.
-                    self.index = int(self._last_working_index if self._last_working_index is not None else 0)
-            except Exception:
-                Logger.exception("AndroidSafeCamera: could not set index=0")
-
-            try:
+                    self.index = self._last_working_index if self._last_working_index is not None else 0
                 # Ensure CoreCamera exists before starting (index might already be set).
-                try:
-                    if getattr(self, "_camera", None) is None and hasattr(self, "_on_index"):
-                        self._on_index()
-                except Exception:
-                    pass
+                if getattr(self, "_camera", None) is None:
+                    self._on_index()
                 return super().on_play(_instance, value)
-            except Exception:
-                Logger.exception("AndroidSafeCamera: failed starting play=%s", value)
-                # Reset to a safe disconnected state.
-                try:
-                    self.index = -2
-                except Exception:
-                    pass
-                try:
-                    self.play = False
-                except Exception:
-                    pass
-                return None
 
-        # playing == False: stop first, then disconnect the underlying camera service.
-        ret = None
-        try:
+            # playing == False: stop first, then disconnect the underlying camera service.
             ret = super().on_play(_instance, value)
-        except Exception:
-            pass
-        try:
             self.index = -2
+            return ret
         except Exception:
-            pass
-        return ret
+            Logger.exception("AndroidSafeCamera: failed toggling play=%s", value)
+            # Reset to a safe disconnected state.
+            try:
+                self.index = -2
+                self.play = False
+            except Exception:
+                pass
+            return None
@@ -28,10 +28,9 @@ else:
     from apscheduler.schedulers.background import BackgroundScheduler
     from fastapi import FastAPI
     from fastapi.staticfiles import StaticFiles
-    from sqlalchemy.orm import Session
 
-    from database import Base, SessionLocal, engine
-    from models import ChatMessage
+    from database import Base, engine
+    from utils.chat_retention import delete_messages_before
     from routers.auth import router as auth_router
     from routers.match_routes import router as match_router
     from routers.public_chat import router as public_router
@@ -51,11 +50,33 @@ else:
         pass
     app.mount("/static", StaticFiles(directory=upload_root), name="static")
 
+    # Bump when _sqlite_ensure_columns learns a new column.
+    _SQLITE_SCHEMA_VERSION = "3"
+
+    def _sqlite_schema_marker() -> str | None:
+        """Marker file next to the SQLite DB recording which patch level it has."""
+        db_path = engine.url.database
+        if not db_path or db_path == ":memory:":
+            return None
+        return f"{os.path.abspath(db_path)}.schema_v{_SQLITE_SCHEMA_VERSION}"
+
     # Lightweight SQLite schema patching for local dev (Render uses Postgres + scripts/db_update.sql).
     def _sqlite_ensure_columns() -> None:
         try:
             if not str(engine.url).startswith("sqlite"):
                 return
+            # Skip the PRAGMA probes when this DB file was already patched; the
+            # marker stores the file's inode so a swapped-in DB is re-checked.
+            marker = _sqlite_schema_marker()
+            db_ino = ""
+            if marker:
+                db_ino = str(os.stat(engine.url.database).st_ino)
+                try:
+                    with open(marker, "r", encoding="utf-8") as f:
+                        if f.read().strip() == db_ino:
+                            return
+                except OSError:
+                    pass
             from sqlalchemy import text
 
             with engine.begin() as conn:
@@ -86,6 +107,10 @@ else:
                     conn.execute(text("ALTER TABLE chat_sessions ADD COLUMN ended_at DATETIME"))
                 if "ended_by_id" not in sess_existing:
                     conn.execute(text("ALTER TABLE chat_sessions ADD COLUMN ended_by_id INTEGER"))
+
+            if marker:
+                with open(marker, "w", encoding="utf-8") as f:
+                    f.write(db_ino)
         except Exception:
             # Never block app startup for local dev migrations.
             pass
@@ -98,22 +123,47 @@ else:
     app.include_router(sub_router, prefix="/api")
     app.include_router(report_router, prefix="/api")
 
+    # Arbitrary app-wide key for the cleanup advisory lock (Postgres only).
+    _CLEANUP_LOCK_KEY = 480_048
+
     def _cleanup_old_messages() -> int:
-        """Delete chat history older than 48 hours."""
+        """Delete chat history older than 48 hours, in bounded chunks."""
+        from sqlalchemy import text
+
         cutoff = datetime.utcnow() - timedelta(hours=48)
-        db: Session = SessionLocal()
-        try:
-            deleted = db.query(ChatMessage).filter(ChatMessage.created_at < cutoff).delete()
-            db.commit()
-            return int(deleted or 0)
-        finally:
-            db.close()
+        # A dedicated connection so the Postgres session lock stays with it.
+        with engine.connect() as conn:
+            # Every uvicorn worker runs its own scheduler; on Postgres only the
+            # worker that wins this lock does the DELETE.
+            pg = conn.dialect.name == "postgresql"
+            if pg:
+                got = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": _CLEANUP_LOCK_KEY}).scalar()
+                conn.commit()
+                if not got:
+                    return 0
+            try:
+                return delete_messages_before(conn, cutoff)
+            finally:
+                if pg:
+                    conn.rollback()
+                    conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _CLEANUP_LOCK_KEY})
+                    conn.commit()
 
     @app.on_event("startup")
     def _start_scheduler():
         # Run periodic cleanup (48h retention).
         sched = BackgroundScheduler(timezone=os.getenv("TZ", "UTC"))
-        sched.add_job(_cleanup_old_messages, "interval", minutes=30, id="cleanup_old_messages", replace_existing=True)
+        sched.add_job(
+            _cleanup_old_messages,
+            "interval",
+            minutes=30,
+            id="cleanup_old_messages",
+            replace_existing=True,
+            # One run at a time, and a single catch-up run after a stall.
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=300,
+        )
         sched.start()
         app.state._scheduler = sched
 
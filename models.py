@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -51,6 +51,12 @@ class User(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Case-insensitive identifier lookups (login / OTP / password reset).
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email)),
+        Index("ix_users_username_lower", func.lower(username)),
+    )
+
 
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
@@ -58,10 +64,11 @@ class ChatSession(Base):
     id = Column(Integer, primary_key=True)
     mode = Column(String, nullable=False)  # "text" | "video"
 
-    user_a_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    user_b_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Indexed to match scripts/db_update.sql: session lookups filter on either side.
+    user_a_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    user_b_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
     # Video sessions can be ended explicitly.
     ended_at = Column(DateTime, nullable=True)
@@ -76,7 +83,7 @@ class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
     id = Column(Integer, primary_key=True)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     message = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -84,6 +91,12 @@ class ChatMessage(Base):
     session = relationship("ChatSession")
     sender = relationship("User")
 
+    # History reads filter by session and order by time; the standalone
+    # created_at index still serves the retention cleanup.
+    __table_args__ = (
+        Index("ix_chat_messages_session_created", "session_id", "created_at"),
+    )
+
 
 class PublicMessage(Base):
     __tablename__ = "public_messages"
@@ -107,6 +120,11 @@ class Swipe(Base):
     direction = Column(String, nullable=False)  # "left" | "right"
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
+    # Serves the "already swiped?" NOT EXISTS probe in /profiles/next.
+    __table_args__ = (
+        Index("ix_swipes_user_target", "user_id", "target_user_id"),
+    )
+
 
 class Report(Base):
     __tablename__ = "reports"
@@ -130,8 +148,19 @@ class Subscription(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     product_id = Column(String, nullable=False)
     purchase_token = Column(String, nullable=False, unique=True)
-    expiry_time_millis = Column(String, nullable=True) # Storing as string to handle large longs safely or BigInteger
+    expiry_time_millis = Column(BigInteger, nullable=True) # Google Play expiryTimeMillis (epoch ms)
     status = Column(String, default="active", nullable=False) # active, expired, canceled
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # Entitlement lookups only care about active rows.
+    __table_args__ = (
+        Index(
+            "ix_subscriptions_active_user",
+            "user_id",
+            "expiry_time_millis",
+            postgresql_where=(status == "active"),
+            sqlite_where=(status == "active"),
+        ),
+    )
+
     user = relationship("User", backref="subscriptions")
@@ -1,86 +1,270 @@
 from __future__ import annotations
 
 import os
-import re
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt
-import bcrypt
-from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
-
-from database import get_db
+from datetime import datetime
+from typing import Annotated, Optional
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+try:
+    import redis  # type: ignore
+except Exception:  # pragma: no cover
+    redis = None
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
+import jwt
+from pydantic import AfterValidator, BaseModel, ConfigDict, EmailStr, field_validator
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+
+from database import engine, get_db, get_read_db
 from models import User
-from utils.otp_service import otp_issue, otp_verify
+from utils.otp_service import otp_persist, otp_send, otp_verify
+from utils.passwords import GUEST_BCRYPT_ROUNDS, dummy_verify, hash_password, needs_rehash, verify_password
 
 
-router = APIRouter(prefix="/auth", tags=["auth"])
-bearer = HTTPBearer(auto_error=False)
+router = APIRouter(
+    prefix="/auth",
+    tags=["auth"],
+    # orjson renders the response bodies natively when it's installed.
+    default_response_class=ORJSONResponse if orjson else JSONResponse,
+)
 
 JWT_SECRET = os.getenv("JWT_SECRET", "change_me")
 JWT_ALG = os.getenv("JWT_ALG", "HS256")
 JWT_EXP_MIN = int(os.getenv("JWT_EXP_MIN", "43200"))  # 30 days default
-
+_JWT_EXP_SEC = JWT_EXP_MIN * 60
+# HMAC key bytes, encoded once instead of on every sign/verify.
+_JWT_KEY = JWT_SECRET.encode("utf-8")
+
+# Presence write throttle: user id -> time.monotonic() of this worker's last write.
+PRESENCE_WRITE_TTL = float(os.getenv("PRESENCE_WRITE_TTL", "60"))
+_PRESENCE_WRITTEN: dict[int, float] = {}
+_PRESENCE_WRITTEN_MAX = 100_000
+_PRESENCE_REDIS = None
+_PRESENCE_REDIS_READY = False
+
+# Verified-token LRU: raw JWT -> (user id, is_guest, time.monotonic() expiry).
+# Entries never outlive the token's own `exp`.
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "30"))
+_TOKEN_CACHE: "OrderedDict[str, tuple[int, bool, float]]" = OrderedDict()
+_TOKEN_CACHE_MAX = int(os.getenv("TOKEN_CACHE_MAX", "8192"))
+_TOKEN_CACHE_LOCK = threading.Lock()
 
 def _now() -> datetime:
     return datetime.utcnow()
 
 
+def _presence_redis():
+    """Shared Redis client for the cross-worker presence throttle (None without REDIS_URL)."""
+    global _PRESENCE_REDIS, _PRESENCE_REDIS_READY
+    if not _PRESENCE_REDIS_READY:
+        url = os.getenv("REDIS_URL")
+        if url and redis:
+            _PRESENCE_REDIS = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        _PRESENCE_REDIS_READY = True
+    return _PRESENCE_REDIS
+
+
+def _mark_presence_written(user_id: int, mono: float) -> None:
+    if len(_PRESENCE_WRITTEN) >= _PRESENCE_WRITTEN_MAX:
+        # Drop stale stamps first; if everything is fresh, start over.
+        cutoff = mono - PRESENCE_WRITE_TTL
+        for uid in [k for k, v in _PRESENCE_WRITTEN.items() if v < cutoff]:
+            _PRESENCE_WRITTEN.pop(uid, None)
+        if len(_PRESENCE_WRITTEN) >= _PRESENCE_WRITTEN_MAX:
+            _PRESENCE_WRITTEN.clear()
+    _PRESENCE_WRITTEN[user_id] = mono
+
+
+def _decode_token(token: str) -> tuple[int, bool]:
+    """
+    Verify a bearer token and return (user_id, is_guest).
+
+    Results are cached per token for TOKEN_CACHE_TTL seconds so polling
+    clients don't pay for a signature check on every request.
+    """
+    mono = time.monotonic()
+    with _TOKEN_CACHE_LOCK:
+        hit = _TOKEN_CACHE.get(token)
+        if hit is not None:
+            if hit[2] > mono:
+                _TOKEN_CACHE.move_to_end(token)
+                return hit[0], hit[1]
+            del _TOKEN_CACHE[token]
+
+    try:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=[JWT_ALG])
+        user_id = int(payload.get("sub") or 0)
+    except Exception:
+        raise HTTPException(401, "Invalid token")
+    if not user_id:
+        raise HTTPException(401, "Invalid token")
+    is_guest = bool(payload.get("is_guest"))
+
+    ttl = TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl > 0:
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[token] = (user_id, is_guest, mono + ttl)
+            _TOKEN_CACHE.move_to_end(token)
+            while len(_TOKEN_CACHE) > _TOKEN_CACHE_MAX:
+                _TOKEN_CACHE.popitem(last=False)
+    return user_id, is_guest
+
+
+def _send_otp(*, identifier: str, to_email: str, code: str) -> None:
+    """
+    Email an already-stored OTP after the response has gone out.
+
+    Runs as a background task, so the DB session is already closed and a
+    slow email API doesn't hold up the request.
+    """
+    try:
+        otp_send(to_email=to_email, code=code)
+    except Exception as e:
+        print(f"OTP delivery failed for {identifier}: {e}")
+
+
 def _create_token(*, user_id: int, is_guest: bool = False) -> str:
+    iat = int(time.time())
     payload = {
         "sub": str(user_id),
         "is_guest": bool(is_guest),
-        "iat": int(_now().timestamp()),
-        "exp": int((_now() + timedelta(minutes=JWT_EXP_MIN)).timestamp()),
+        "iat": iat,
+        "exp": iat + _JWT_EXP_SEC,
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALG)
+
+
+def bearer_token(request: Request) -> str:
+    """
+    Raw token from `Authorization: Bearer <token>`.
+
+    A plain header split; skips HTTPBearer's credentials object on every
+    authenticated request.
+    """
+    scheme, _, token = (request.headers.get("authorization") or "").partition(" ")
+    token = token.strip()
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(401, "Missing Authorization token")
+    return token
 
 
 def get_current_user(
-    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+    token: str = Depends(bearer_token),
     db: Session = Depends(get_db),
 ) -> User:
-    if not creds or not creds.credentials:
-        raise HTTPException(401, "Missing Authorization token")
-    token = creds.credentials
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
-    except Exception:
-        raise HTTPException(401, "Invalid token")
-    sub = payload.get("sub")
-    if not sub:
-        raise HTTPException(401, "Invalid token")
-    user = db.get(User, int(sub))
+    user_id, _ = _decode_token(token)
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(401, "User not found")
 
     # Update presence (throttled) so profiles can show "online" status.
+    # A process-local stamp skips the check entirely for users this worker
+    # wrote recently; the online window (2 min) is well above the TTL.
+    mono = time.monotonic()
+    written = _PRESENCE_WRITTEN.get(user.id)
+    if written is not None and mono - written < PRESENCE_WRITE_TTL:
+        return user
+    # With Redis, SET NX elects one writer per user per TTL across all workers.
+    r = _presence_redis()
+    if r is not None:
+        try:
+            if not r.set(f"presence:{user.id}", 1, ex=max(1, int(PRESENCE_WRITE_TTL)), nx=True):
+                _mark_presence_written(user.id, mono)
+                return user
+        except Exception:
+            pass  # Redis unavailable: fall back to the DB-side check.
     now = _now()
     try:
         if (user.last_active_at is None) or ((now - user.last_active_at).total_seconds() >= 30):
-            user.last_active_at = now
-            db.add(user)
-            db.commit()
+            # Own short transaction: committing the request session would
+            # expire `user` and cost a reload SELECT on the next attribute read.
+            with engine.begin() as conn:
+                conn.execute(update(User).where(User.id == user.id).values(last_active_at=now))
+            set_committed_value(user, "last_active_at", now)
+        _mark_presence_written(user.id, mono)
     except Exception:
         # Presence updates should never block the request.
-        db.rollback()
+        pass
     return user
 
 
+def _find_user(db: Session, ident: str, *only) -> Optional[User]:
+    """
+    Look up a user by lowercased email or username.
+
+    Compares on lower(column) so the lookup stays on the functional
+    ix_users_*_lower indexes even for rows stored with mixed case.
+    Pass columns in `only` to load just those (others lazy-load on access).
+    """
+    col = User.email if "@" in ident else User.username
+    stmt = select(User).where(func.lower(col) == ident).limit(1)
+    if only:
+        stmt = stmt.options(load_only(*only))
+    return db.scalars(stmt).first()
+
+
+class UserOut(BaseModel):
+    """Public user payload shared by the login, guest and profile responses."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: Optional[str] = None
+    username: Optional[str] = None
+    name: str
+    gender: str
+    country: str
+    description: str = ""
+    image_url: str = ""
+    is_subscribed: bool = False
+    last_active_at: Optional[datetime] = None
+
+    @field_validator("description", "image_url", mode="before")
+    @classmethod
+    def _none_to_empty(cls, v):
+        return v or ""
+
+    @field_validator("is_subscribed", mode="before")
+    @classmethod
+    def _none_to_false(cls, v):
+        return bool(v)
+
+
+def _user_out(user: User, exclude: Optional[set] = None) -> dict:
+    return UserOut.model_validate(user).model_dump(mode="json", exclude=exclude)
+
+
 def _norm_gender(v: str) -> str:
     return (v or "").strip().lower()
 
 
+# Request fields normalized once at the model boundary.
+Identifier = Annotated[str, AfterValidator(lambda v: v.strip().lower())]
+Password = Annotated[str, AfterValidator(str.strip)]
+OtpCode = Annotated[str, AfterValidator(str.strip)]
+
+
 class RegisterIn(BaseModel):
     email: EmailStr
     username: Optional[str] = None
-    password: str
+    password: Password
     name: str
     country: str
     gender: str  # male|female|cross
@@ -95,7 +279,7 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)):
 
     if username and len(username) < 3:
         raise HTTPException(400, "Username must be at least 3 characters.")
-    if len(payload.password.strip()) < 6:
+    if len(payload.password) < 6:
         raise HTTPException(400, "Password must be at least 6 characters.")
     if not payload.name.strip():
         raise HTTPException(400, "Name is required.")
@@ -106,18 +290,13 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)):
     if gender not in {"male", "female", "cross"}:
         raise HTTPException(400, "Gender must be male, female, or cross.")
 
-    if email and db.query(User).filter(User.email == email).first():
-        raise HTTPException(400, "entry already available")
-    if username and db.query(User).filter(User.username == username).first():
+    # One round-trip for both uniqueness checks; either hit is a conflict.
+    taken = [c for c in ((User.email == email) if email else None,
+                         (User.username == username) if username else None) if c is not None]
+    if taken and db.query(exists().where(or_(*taken))).scalar():
         raise HTTPException(400, "entry already available")
 
-    # Multi-byte safe password truncation for bcrypt (max 72 bytes)
-    safe_password = payload.password.strip().encode("utf-8")[:72].decode("utf-8", errors="ignore")
-
-    pwd_bytes = safe_password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    password_hash = hashed.decode('utf-8')
+    password_hash = hash_password(payload.password)
 
     user = User(
         email=email,
@@ -130,74 +309,83 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)):
         image_url=(payload.image_url or "").strip() or None,
     )
     db.add(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent sign-up took the email/username after the check above.
+        db.rollback()
+        raise HTTPException(400, "entry already available")
     db.refresh(user)
     return {"ok": True, "user_id": user.id}
 
 
 class LoginOtpRequestIn(BaseModel):
-    identifier: str  # email or username
-    password: str
+    identifier: Identifier  # email or username
+    password: Password
 
 
 @router.post("/login/request-otp")
-def login_request_otp(payload: LoginOtpRequestIn, db: Session = Depends(get_db)):
-    ident = payload.identifier.strip().lower()
+def login_request_otp(
+    payload: LoginOtpRequestIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_read_db),
+):
+    ident = payload.identifier
     if not ident:
         raise HTTPException(400, "Identifier required")
 
-    if "@" in ident:
-        user = db.query(User).filter(User.email == ident).first()
-    else:
-        user = db.query(User).filter(User.username == ident).first()
+    user = _find_user(db, ident, User.id, User.email, User.password_hash)
 
     if not user:
-        raise HTTPException(404, "Account not found.")
+        # Same cost and same response as a wrong password: no enumeration.
+        dummy_verify(payload.password)
+        raise HTTPException(401, "Invalid credentials")
 
-    # Truncate input password to 72 bytes for bcrypt verification
-    login_password = payload.password.strip().encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    if not bcrypt.checkpw(login_password.encode('utf-8'), user.password_hash.encode('utf-8')):
-        raise HTTPException(401, "Incorrect password.")
+    if not verify_password(payload.password, user.password_hash):
+        raise HTTPException(401, "Invalid credentials")
 
     if not user.email:
         raise HTTPException(400, "This account has no email; OTP cannot be delivered.")
 
-    otp_issue(identifier=f"user:{user.id}", to_email=user.email)
+    identifier = f"user:{user.id}"
+    code = otp_persist(identifier=identifier)
+    background_tasks.add_task(_send_otp, identifier=identifier, to_email=user.email, code=code)
     return {"ok": True, "message": "OTP sent to your email."}
 
 
 class LoginVerifyOtpIn(BaseModel):
-    identifier: str
-    password: str
-    otp: str
+    identifier: Identifier
+    password: Password
+    otp: OtpCode
 
 
 @router.post("/login/verify-otp")
 def login_verify_otp(payload: LoginVerifyOtpIn, db: Session = Depends(get_db)):
-    ident = payload.identifier.strip().lower()
+    ident = payload.identifier
 
-    if "@" in ident:
-        user = db.query(User).filter(User.email == ident).first()
-    else:
-        user = db.query(User).filter(User.username == ident).first()
+    user = _find_user(db, ident)
 
     if not user:
-        raise HTTPException(404, "Account not found.")
+        # Same cost and same response as a wrong password: no enumeration.
+        dummy_verify(payload.password)
+        raise HTTPException(401, "Invalid credentials")
 
-    # Truncate input password to 72 bytes for bcrypt verification
-    login_password = payload.password.strip().encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    if not bcrypt.checkpw(login_password.encode('utf-8'), user.password_hash.encode('utf-8')):
-        raise HTTPException(401, "Incorrect password.")
+    if not verify_password(payload.password, user.password_hash):
+        raise HTTPException(401, "Invalid credentials")
 
-    ok = otp_verify(identifier=f"user:{user.id}", otp=payload.otp.strip())
+    ok = otp_verify(identifier=f"user:{user.id}", otp=payload.otp)
     if not ok:
         raise HTTPException(401, "Invalid/expired OTP.")
 
     token = _create_token(user_id=user.id, is_guest=False)
     # Mark online immediately on login.
     try:
-        user.last_active_at = _now()
-        db.add(user)
+        now = _now()
+        values = {"last_active_at": now}
+        # Upgrade hashes left at an older BCRYPT_ROUNDS while we hold the plaintext.
+        if needs_rehash(user.password_hash):
+            values["password_hash"] = hash_password(payload.password)
+        db.execute(update(User).where(User.id == user.id).values(**values))
         db.commit()
     except Exception:
         db.rollback()
@@ -205,18 +393,7 @@ def login_verify_otp(payload: LoginVerifyOtpIn, db: Session = Depends(get_db)):
         "ok": True,
         "access_token": token,
         "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "email": user.email,
-            "username": user.username,
-            "name": user.name,
-            "gender": user.gender,
-            "country": user.country,
-            "description": user.description or "",
-            "image_url": user.image_url or "",
-            "is_subscribed": bool(user.is_subscribed),
-            "last_active_at": user.last_active_at.isoformat() if user.last_active_at else None,
-        },
+        "user": _user_out(user),
     }
 
 
@@ -224,45 +401,31 @@ def login_verify_otp(payload: LoginVerifyOtpIn, db: Session = Depends(get_db)):
 def guest_login(db: Session = Depends(get_db)):
     """Creates a lightweight guest user for 'login as guest'."""
     # Generate a safe random password under 72 bytes
-    random_pass = secrets.token_hex(16)[:16]
-    safe_password = random_pass.encode("utf-8")[:72].decode("utf-8", errors="ignore")
-
-    pwd_bytes = safe_password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    password_hash = hashed.decode('utf-8')
-
-    # Determine next guest number
-    existing_guests = db.query(User.username).filter(User.username.like("guest_%")).all()
-    max_num = 0
-    for row in existing_guests:
-        uname = row[0]
-        m = re.match(r"^guest_(\d+)$", uname)
-        if m:
-            try:
-                num = int(m.group(1))
-                if num > max_num:
-                    max_num = num
-            except ValueError:
-                pass
-    
-    new_num = max_num + 1
-    new_username = f"guest_{new_num}"
-    new_name = f"Guest {new_num}"
-
-    guest = User(
-        email=None,
-        username=new_username,
-        password_hash=password_hash,
-        name=new_name,
-        gender="male",
-        country="",
-        description="",
-        image_url="",
-        is_subscribed=False,
-    )
-    db.add(guest)
-    db.commit()
+    password_hash = hash_password(secrets.token_hex(16)[:16], rounds=GUEST_BCRYPT_ROUNDS)
+
+    # Random suffix: O(1), no lookup of existing guests, and doesn't leak
+    # how many accounts exist. Retry on the (~2^-32) clash.
+    for attempt in range(3):
+        suffix = secrets.token_hex(4)
+        guest = User(
+            email=None,
+            username=f"guest_{suffix}",
+            password_hash=password_hash,
+            name=f"Guest {suffix}",
+            gender="male",
+            country="",
+            description="",
+            image_url="",
+            is_subscribed=False,
+        )
+        db.add(guest)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt == 2:
+                raise HTTPException(503, "Could not create a guest account, please retry.")
     db.refresh(guest)
     # Mark online immediately on guest creation/login.
     try:
@@ -278,33 +441,27 @@ def guest_login(db: Session = Depends(get_db)):
         "access_token": token,
         "token_type": "bearer",
         "user": {
-            "id": guest.id,
-            "username": guest.username,
-            "name": guest.name,
-            "gender": guest.gender,
-            "country": guest.country,
-            "description": guest.description or "",
-            "image_url": guest.image_url or "",
+            **_user_out(guest, exclude={"email"}),
             "is_subscribed": False,
             "is_guest": True,
-            "last_active_at": guest.last_active_at.isoformat() if guest.last_active_at else None,
         },
     }
 
 
 class ForgotPasswordRequestIn(BaseModel):
-    identifier: str
+    identifier: Identifier
 
 @router.post("/forgot-password/request-otp")
-def forgot_password_request_otp(payload: ForgotPasswordRequestIn, db: Session = Depends(get_db)):
-    ident = payload.identifier.strip().lower()
+def forgot_password_request_otp(
+    payload: ForgotPasswordRequestIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_read_db),
+):
+    ident = payload.identifier
     if not ident:
         raise HTTPException(400, "Identifier required")
 
-    if "@" in ident:
-        user = db.query(User).filter(User.email == ident).first()
-    else:
-        user = db.query(User).filter(User.username == ident).first()
+    user = _find_user(db, ident, User.id, User.email)
 
     if not user:
         raise HTTPException(404, "Account not found.")
@@ -312,42 +469,37 @@ def forgot_password_request_otp(payload: ForgotPasswordRequestIn, db: Session =
     if not user.email:
         raise HTTPException(400, "This account has no email; OTP cannot be delivered.")
 
-    otp_issue(identifier=f"reset:{user.id}", to_email=user.email)
+    identifier = f"reset:{user.id}"
+    code = otp_persist(identifier=identifier)
+    background_tasks.add_task(_send_otp, identifier=identifier, to_email=user.email, code=code)
     return {"ok": True, "message": "OTP sent to your email."}
 
 
 class ForgotPasswordResetIn(BaseModel):
-    identifier: str
-    otp: str
-    new_password: str
+    identifier: Identifier
+    otp: OtpCode
+    new_password: Password
 
 @router.post("/forgot-password/reset")
 def forgot_password_reset(payload: ForgotPasswordResetIn, db: Session = Depends(get_db)):
-    ident = payload.identifier.strip().lower()
+    ident = payload.identifier
     
-    if "@" in ident:
-        user = db.query(User).filter(User.email == ident).first()
-    else:
-        user = db.query(User).filter(User.username == ident).first()
+    user = _find_user(db, ident, User.id)
 
     if not user:
         raise HTTPException(404, "Account not found.")
 
     # Verify OTP
-    ok = otp_verify(identifier=f"reset:{user.id}", otp=payload.otp.strip())
+    ok = otp_verify(identifier=f"reset:{user.id}", otp=payload.otp)
     if not ok:
         raise HTTPException(401, "Invalid/expired OTP.")
 
-    if len(payload.new_password.strip()) < 6:
+    if len(payload.new_password) < 6:
         raise HTTPException(400, "Password must be at least 6 characters.")
 
     # Update Password
-    safe_password = payload.new_password.strip().encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    pwd_bytes = safe_password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(pwd_bytes, salt)
-    user.password_hash = hashed.decode('utf-8')
-    
+    password_hash = hash_password(payload.new_password)
+    db.execute(update(User).where(User.id == user.id).values(password_hash=password_hash))
     db.commit()
     return {"ok": True, "message": "Password updated successfully."}
 
@@ -383,21 +535,52 @@ def update_profile(
 
     return {
         "ok": True,
-        "user": {
-            "id": current_user.id,
-            "email": current_user.email,
-            "username": current_user.username,
-            "name": current_user.name,
-            "gender": current_user.gender,
-            "country": current_user.country,
-            "description": current_user.description or "",
-            "image_url": current_user.image_url or "",
-            "is_subscribed": bool(current_user.is_subscribed),
-            "last_active_at": current_user.last_active_at.isoformat() if current_user.last_active_at else None,
-        },
+        "user": _user_out(current_user),
     }
 
 
+_UPLOAD_CHUNK = 64 * 1024
+
+_IMAGE_MAGIC = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+)
+
+
+def _sniff_image_ext(head: bytes) -> Optional[str]:
+    """File extension for a JPEG/PNG/WEBP header, or None."""
+    for magic, ext in _IMAGE_MAGIC:
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _copy_upload(src, dst: Path, max_bytes: int) -> int:
+    """
+    Stream an upload's spooled file to `dst` in fixed-size chunks.
+
+    Peak memory is one chunk rather than the whole image; the partial file
+    is removed if the size limit is exceeded.
+    """
+    size = 0
+    src.seek(0)
+    with dst.open("wb") as out:
+        while True:
+            chunk = src.read(_UPLOAD_CHUNK)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                break
+            out.write(chunk)
+    if size > max_bytes:
+        dst.unlink(missing_ok=True)
+        raise HTTPException(400, f"Image too large (max {max_bytes} bytes).")
+    return size
+
+
 @router.post("/profile/image")
 async def upload_profile_image(
     file: UploadFile = File(...),
@@ -410,24 +593,17 @@ async def upload_profile_image(
     Saves to: {UPLOAD_DIR}/profile/<user>_<ts>_<rand>.<ext>
     Served at: /static/profile/<...>
     """
-    # Basic validation
-    content_type = (file.content_type or "").lower().strip()
-    allowed = {
-        "image/jpeg": "jpg",
-        "image/jpg": "jpg",
-        "image/png": "png",
-        "image/webp": "webp",
-    }
-    if content_type not in allowed:
-        raise HTTPException(400, "Unsupported image type. Use JPG/PNG/WEBP.")
-
     # Limit upload size (best-effort; FastAPI also allows server-side limits)
     max_bytes = int(os.getenv("PROFILE_IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))
-    data = await file.read()
-    if not data:
+
+    # The declared type is client-controlled; the file's magic bytes decide.
+    head = await file.read(12)
+    await file.seek(0)
+    if not head:
         raise HTTPException(400, "Empty file.")
-    if len(data) > max_bytes:
-        raise HTTPException(400, f"Image too large (max {max_bytes} bytes).")
+    ext = _sniff_image_ext(head)
+    if not ext:
+        raise HTTPException(400, "Unsupported image type. Use JPG/PNG/WEBP.")
 
     upload_root = Path(os.getenv("UPLOAD_DIR", "uploads"))
     profile_dir = upload_root / "profile"
@@ -436,15 +612,17 @@ async def upload_profile_image(
     except Exception:
         pass
 
-    ext = allowed[content_type]
     nonce = secrets.token_hex(4)
     ts = int(time.time())
     fname = f"user_{current_user.id}_{ts}_{nonce}.{ext}"
     dst = profile_dir / fname
 
     try:
-        dst.write_bytes(data)
+        await run_in_threadpool(_copy_upload, file.file, dst, max_bytes)
+    except HTTPException:
+        raise
     except Exception:
+        dst.unlink(missing_ok=True)
         raise HTTPException(500, "Failed to save uploaded image.")
 
     # Store served path
@@ -455,16 +633,5 @@ async def upload_profile_image(
 
     return {
         "ok": True,
-        "user": {
-            "id": current_user.id,
-            "email": current_user.email,
-            "username": current_user.username,
-            "name": current_user.name,
-            "gender": current_user.gender,
-            "country": current_user.country,
-            "description": current_user.description or "",
-            "image_url": current_user.image_url or "",
-            "is_subscribed": bool(current_user.is_subscribed),
-            "last_active_at": current_user.last_active_at.isoformat() if current_user.last_active_at else None,
-        },
+        "user": _user_out(current_user),
     }
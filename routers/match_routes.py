@@ -6,8 +6,8 @@ import random
 import time
 from typing import Optional
 
-from sqlalchemy import or_, func
-from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import case, func, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -15,6 +15,8 @@ from database import get_db
 from models import ChatMessage, ChatSession, Swipe, User
 from routers.auth import get_current_user
 from utils.agora_rtc_token import build_rtc_token_from_env
+from utils.chat_retention import delete_messages_before
+from utils.http_cache import etag_json_response
 
 
 router = APIRouter(tags=["match"])
@@ -175,12 +177,13 @@ def get_next_profile(
     if pref not in {"male", "female", "both"}:
         raise HTTPException(400, "Invalid preference.")
 
-    swiped_ids = [r[0] for r in db.query(Swipe.target_user_id).filter(Swipe.user_id == user.id).all()]
-
-    q = db.query(User).filter(User.id != user.id)
-    
-    if swiped_ids:
-        q = q.filter(~User.id.in_(swiped_ids))
+    # Anti-join instead of shipping every swiped id back as a giant IN list.
+    already_swiped = (
+        db.query(Swipe.id)
+        .filter(Swipe.user_id == user.id, Swipe.target_user_id == User.id)
+        .exists()
+    )
+    q = db.query(User).filter(User.id != user.id, ~already_swiped)
     if pref != "both":
         q = q.filter(User.gender == pref)
 
@@ -478,68 +481,80 @@ def end_video_call(
 
 @router.get("/sessions/history")
 def get_chat_history(
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     """
     Returns a list of unique users the current user has chatted with.
     """
-    sessions = (
-        db.query(ChatSession)
-        .filter(or_(ChatSession.user_a_id == user.id, ChatSession.user_b_id == user.id))
+    # Latest session per peer, with the peer row, in one statement (no lazy
+    # user_a/user_b loads per session).
+    peer_id = case((ChatSession.user_a_id == user.id, ChatSession.user_b_id), else_=ChatSession.user_a_id)
+    ranked = (
+        select(
+            ChatSession.id.label("sid"),
+            peer_id.label("peer_id"),
+            func.row_number()
+            .over(partition_by=peer_id, order_by=(ChatSession.created_at.desc(), ChatSession.id.desc()))
+            .label("rn"),
+        )
+        .where(or_(ChatSession.user_a_id == user.id, ChatSession.user_b_id == user.id))
+        .subquery()
+    )
+    rows = (
+        db.query(ChatSession, User)
+        .join(ranked, ranked.c.sid == ChatSession.id)
+        .join(User, User.id == ranked.c.peer_id)
+        .filter(ranked.c.rn == 1)
         .order_by(ChatSession.created_at.desc())
         .all()
     )
 
+    # Lightweight "last message" summary for unread indicators on the client,
+    # fetched for all listed sessions at once.
+    last_by_session = {}
+    if rows:
+        try:
+            latest_ids = (
+                select(func.max(ChatMessage.id))
+                .where(ChatMessage.session_id.in_([s.id for s, _ in rows]))
+                .group_by(ChatMessage.session_id)
+            )
+            for m in db.query(ChatMessage).filter(ChatMessage.id.in_(latest_ids)):
+                last_by_session[m.session_id] = m
+        except Exception:
+            # Best-effort only; never block history.
+            pass
+
     history_map = {}
-    for s in sessions:
-        other_id = s.user_b_id if s.user_a_id == user.id else s.user_a_id
-        if other_id not in history_map:
-            other = s.user_b if s.user_a_id == user.id else s.user_a
-            if other:
-                # Lightweight "last message" summary for unread indicators on the client.
-                last_message_id = 0
-                last_message_sender_id = 0
-                last_message_text = ""
-                last_message_at = None
-                try:
-                    last_msg = (
-                        db.query(ChatMessage)
-                        .filter(ChatMessage.session_id == s.id)
-                        .order_by(ChatMessage.id.desc())
-                        .first()
-                    )
-                    if last_msg:
-                        last_message_id = int(last_msg.id or 0)
-                        last_message_sender_id = int(last_msg.sender_id or 0)
-                        last_message_text = str(last_msg.message or "")
-                        try:
-                            last_message_at = last_msg.created_at.isoformat() if last_msg.created_at else None
-                        except Exception:
-                            last_message_at = None
-                except Exception:
-                    # Best-effort only; never block history.
-                    pass
-
-                history_map[other_id] = {
-                    "user_id": other.id,
-                    "name": other.name,
-                    "image_url": other.image_url,
-                    "last_seen": s.created_at.isoformat(),
-                    "session_id": s.id,
-                    "mode": s.mode,
-                    "is_on_call": bool(other.is_on_call),
-                    "is_online": _is_online(other),
-                    "last_message_id": last_message_id,
-                    "last_message_sender_id": last_message_sender_id,
-                    "last_message_text": last_message_text,
-                    "last_message_at": last_message_at,
-                }
+    for s, other in rows:
+        last_msg = last_by_session.get(s.id)
+        last_message_at = None
+        if last_msg is not None and last_msg.created_at:
+            last_message_at = last_msg.created_at.isoformat()
+        history_map[other.id] = {
+            "user_id": other.id,
+            "name": other.name,
+            "image_url": other.image_url,
+            "last_seen": s.created_at.isoformat(),
+            "session_id": s.id,
+            "mode": s.mode,
+            "is_on_call": bool(other.is_on_call),
+            "is_online": _is_online(other),
+            "last_message_id": int(last_msg.id or 0) if last_msg is not None else 0,
+            "last_message_sender_id": int(last_msg.sender_id or 0) if last_msg is not None else 0,
+            "last_message_text": str(last_msg.message or "") if last_msg is not None else "",
+            "last_message_at": last_message_at,
+        }
     
-    return {
-        "ok": True,
-        "history": list(history_map.values())
-    }
+    return etag_json_response(
+        request,
+        {
+            "ok": True,
+            "history": list(history_map.values())
+        },
+    )
 
 
 @router.post("/messages")
@@ -620,6 +635,5 @@ def demo_activate_subscription(
 @router.delete("/cleanup-chats")
 def cleanup_old_chats(db: Session = Depends(get_db)):
     expiry = datetime.utcnow() - timedelta(hours=48)
-    deleted = db.query(ChatMessage).filter(ChatMessage.created_at < expiry).delete()
-    db.commit()
-    return {"ok": True, "deleted": int(deleted or 0)}
+    deleted = delete_messages_before(db, expiry)
+    return {"ok": True, "deleted": deleted}
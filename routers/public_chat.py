@@ -3,13 +3,14 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models import PublicMessage, User
 from routers.auth import get_current_user
+from utils.http_cache import etag_json_response
 
 router = APIRouter(tags=["public"])
 
@@ -21,6 +22,7 @@ class PublicMessageIn(BaseModel):
 
 @router.get("/public/messages")
 def get_public_messages(
+    request: Request,
     limit: int = 500,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -37,20 +39,23 @@ def get_public_messages(
     # Return in chronological order
     msgs.reverse()
     
-    return {
-        "ok": True,
-        "messages": [
-            {
-                "id": m.id,
-                "sender_id": m.sender_id,
-                "sender_name": m.sender.name,
-                "message": m.message,
-                "image_url": m.image_url,
-                "created_at": m.created_at.isoformat(),
-            }
-            for m in msgs
-        ],
-    }
+    return etag_json_response(
+        request,
+        {
+            "ok": True,
+            "messages": [
+                {
+                    "id": m.id,
+                    "sender_id": m.sender_id,
+                    "sender_name": m.sender.name,
+                    "message": m.message,
+                    "image_url": m.image_url,
+                    "created_at": m.created_at.isoformat(),
+                }
+                for m in msgs
+            ],
+        },
+    )
 
 
 @router.post("/public/messages")
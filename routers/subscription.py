@@ -132,13 +132,13 @@ def verify_subscription(
                 user_id=user.id,
                 product_id=product_id,
                 purchase_token=token,
-                expiry_time_millis=str(expiry_time_millis) if expiry_time_millis else None,
+                expiry_time_millis=int(expiry_time_millis) if expiry_time_millis else None,
                 status="active"
             )
             db.add(sub)
         else:
             existing.status = "active"
-            existing.expiry_time_millis = str(expiry_time_millis) if expiry_time_millis else None
+            existing.expiry_time_millis = int(expiry_time_millis) if expiry_time_millis else None
         
         user.is_subscribed = True
         db.commit()
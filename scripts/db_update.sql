@@ -56,6 +56,8 @@ UPDATE users SET video_state = 'idle' WHERE video_state IS NULL;
 -- Uniqueness + lookup indexes
 CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_unique ON users (email);
 CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username_unique ON users (username);
+CREATE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email));
+CREATE INDEX IF NOT EXISTS ix_users_username_lower ON users (lower(username));
 
 -- CHAT SESSIONS
 CREATE TABLE IF NOT EXISTS chat_sessions (
@@ -111,7 +113,9 @@ ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS message TEXT;
 ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITHOUT TIME ZONE;
 ALTER TABLE chat_messages ALTER COLUMN created_at SET DEFAULT NOW();
 
-CREATE INDEX IF NOT EXISTS ix_chat_messages_session_id ON chat_messages (session_id);
+CREATE INDEX IF NOT EXISTS ix_chat_messages_session_created ON chat_messages (session_id, created_at);
+-- Covered by the composite index above.
+DROP INDEX IF EXISTS ix_chat_messages_session_id;
 CREATE INDEX IF NOT EXISTS ix_chat_messages_created_at ON chat_messages (created_at);
 
 DO $$
@@ -150,6 +154,7 @@ ALTER TABLE swipes ALTER COLUMN created_at SET DEFAULT NOW();
 CREATE INDEX IF NOT EXISTS ix_swipes_user_id ON swipes (user_id);
 CREATE INDEX IF NOT EXISTS ix_swipes_target_user_id ON swipes (target_user_id);
 CREATE INDEX IF NOT EXISTS ix_swipes_created_at ON swipes (created_at);
+CREATE INDEX IF NOT EXISTS ix_swipes_user_target ON swipes (user_id, target_user_id);
 
 DO $$
 BEGIN
@@ -169,4 +174,22 @@ EXCEPTION WHEN duplicate_object THEN
   NULL;
 END $$;
 
+-- SUBSCRIPTIONS (created by the app's create_all; only patch when present)
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'subscriptions' AND column_name = 'expiry_time_millis'
+      AND data_type <> 'bigint'
+  ) THEN
+    ALTER TABLE subscriptions
+      ALTER COLUMN expiry_time_millis TYPE BIGINT
+      USING NULLIF(expiry_time_millis, '')::bigint;
+  END IF;
+  IF to_regclass('subscriptions') IS NOT NULL THEN
+    CREATE INDEX IF NOT EXISTS ix_subscriptions_active_user
+      ON subscriptions (user_id, expiry_time_millis) WHERE status = 'active';
+  END IF;
+END $$;
+
 COMMIT;
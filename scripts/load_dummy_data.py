@@ -1,7 +1,6 @@
 import os
 import sys
 import yaml
-import bcrypt
 from datetime import datetime
 from sqlalchemy.orm import Session
 
@@ -10,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from database import SessionLocal, engine, Base
 from models import User
+from utils.passwords import hash_password
 
 def load_data():
     Base.metadata.create_all(bind=engine)
@@ -29,12 +29,7 @@ def load_data():
         # Optional: allow dummy YAML to mark users as "online" for match testing.
         # The backend considers a user online if last_active_at is within 2 minutes.
         online = bool(u_data.pop("online", False))
-        # Multi-byte safe password truncation for bcrypt (max 72 bytes)
-        safe_password = password.strip().encode("utf-8")[:72].decode("utf-8", errors="ignore")
-        pwd_bytes = safe_password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(pwd_bytes, salt)
-        password_hash = hashed.decode('utf-8')
+        password_hash = hash_password(password.strip())
         
         if online:
             u_data["last_active_at"] = datetime.utcnow()
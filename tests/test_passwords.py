@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from utils.passwords import needs_rehash  # noqa: E402
+
+_SALT_AND_DIGEST = "N9qo8uLOickgx2ZMRZoMyeIjZAgcfl7p92ldGxad68LJZdL17lhWy"
+
+
+def _hash(cost: int) -> str:
+    return f"$2b${cost:02d}${_SALT_AND_DIGEST}"
+
+
+def test_lower_cost_hash_is_upgraded():
+    assert needs_rehash(_hash(10), rounds=12)
+
+
+def test_higher_cost_hash_is_left_alone():
+    assert not needs_rehash(_hash(12), rounds=4)
+
+
+def test_matching_cost_hash_is_left_alone():
+    assert not needs_rehash(_hash(12), rounds=12)
+
+
+def test_malformed_hash_is_left_alone():
+    assert not needs_rehash("not-a-hash", rounds=12)
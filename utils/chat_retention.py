@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from models import ChatMessage
+
+
+# Rows per DELETE; keeps each transaction (and its locks) short.
+CHAT_CLEANUP_CHUNK = int(os.getenv("CHAT_CLEANUP_CHUNK", "10000"))
+
+
+def delete_messages_before(conn, cutoff: datetime, chunk: int = CHAT_CLEANUP_CHUNK) -> int:
+    """
+    Delete chat messages created before `cutoff`, committing every `chunk` rows.
+
+    `conn` may be a Connection or a Session. Small per-chunk transactions let
+    live message inserts proceed between batches instead of waiting behind
+    one long DELETE.
+    """
+    doomed = (
+        select(ChatMessage.id)
+        .where(ChatMessage.created_at < cutoff)
+        .order_by(ChatMessage.id)
+        .limit(chunk)
+    )
+    # synchronize_session=False: a Session has nothing loaded worth syncing.
+    stmt = (
+        delete(ChatMessage)
+        .where(ChatMessage.id.in_(doomed.scalar_subquery()))
+        .execution_options(synchronize_session=False)
+    )
+    total = 0
+    while True:
+        n = int(conn.execute(stmt).rowcount or 0)
+        conn.commit()
+        total += n
+        if n < chunk:
+            return total
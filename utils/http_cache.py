@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against `etag` (RFC 9110):
+    a comma-separated list, `W/` prefixes ignored, `*` matches anything.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def etag_json_response(request: Request, payload: Any) -> Response:
+    """
+    Serialize `payload` as JSON with a content-hash ETag.
+
+    If the client's If-None-Match matches, return an empty 304 so polling
+    clients skip re-downloading unchanged feeds.
+    """
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hmac
 import os
 import random
 import time
@@ -18,6 +19,19 @@ OTP_SUBJECT = os.getenv("OTP_SUBJECT", "Your login OTP")
 
 
 _MEM: dict[str, tuple[str, float]] = {}
+# Next time.time() at which expired in-memory OTPs are swept out.
+_MEM_NEXT_SWEEP = 0.0
+_MEM_SWEEP_EVERY = 60.0
+
+
+def _sweep_mem(now: float) -> None:
+    """Drop expired in-memory OTPs nobody verified (at most once a minute)."""
+    global _MEM_NEXT_SWEEP
+    if now < _MEM_NEXT_SWEEP:
+        return
+    _MEM_NEXT_SWEEP = now + _MEM_SWEEP_EVERY
+    for key in [k for k, (_, exp) in _MEM.items() if exp < now]:
+        _MEM.pop(key, None)
 
 
 def _redis_client():
@@ -31,9 +45,9 @@ def _gen_otp() -> str:
     return f"{random.randint(100000, 999999)}"
 
 
-def otp_issue(*, identifier: str, to_email: str) -> str:
+def otp_persist(*, identifier: str) -> str:
     """
-    Issues OTP for 'identifier' and sends it to email via Brevo.
+    Generates and stores an OTP for 'identifier' and returns it.
     Stores OTP in Redis if REDIS_URL present; otherwise in-memory.
     """
     code = _gen_otp()
@@ -44,8 +58,14 @@ def otp_issue(*, identifier: str, to_email: str) -> str:
     if r:
         r.setex(key, ttl_seconds, code)
     else:
-        _MEM[key] = (code, time.time() + ttl_seconds)
+        now = time.time()
+        _sweep_mem(now)
+        _MEM[key] = (code, now + ttl_seconds)
+    return code
 
+
+def otp_send(*, to_email: str, code: str) -> None:
+    """Emails an already-stored OTP via Brevo (slow; fine to run in the background)."""
     html = f"""
     <div style="font-family:Arial,sans-serif">
       <h2>Login OTP</h2>
@@ -55,6 +75,15 @@ def otp_issue(*, identifier: str, to_email: str) -> str:
     </div>
     """
     send_email(to_email=to_email, subject=OTP_SUBJECT, html=html, text=f"Your OTP is {code}")
+
+
+def otp_issue(*, identifier: str, to_email: str) -> str:
+    """
+    Issues OTP for 'identifier' and sends it to email via Brevo.
+    Stores OTP in Redis if REDIS_URL present; otherwise in-memory.
+    """
+    code = otp_persist(identifier=identifier)
+    otp_send(to_email=to_email, code=code)
     return code
 
 
@@ -87,10 +116,5 @@ def otp_verify(*, identifier: str, otp: str) -> bool:
 
 def secrets_equal(a: str, b: str) -> bool:
     # Constant-time compare
-    if len(a) != len(b):
-        return False
-    result = 0
-    for x, y in zip(a.encode("utf-8"), b.encode("utf-8")):
-        result |= x ^ y
-    return result == 0
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
 
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import bcrypt
+
+
+# bcrypt work factor for new hashes. Each +1 doubles hashing time; existing
+# hashes keep verifying since the cost is stored inside them.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS") or os.getenv("BCRYPT_COST") or "12")
+# Guest accounts get a random password nobody ever types, so the hash only
+# has to exist; bcrypt's minimum cost keeps guest sign-up cheap.
+GUEST_BCRYPT_ROUNDS = 4
+
+# Auth endpoints are sync and already run on the server threadpool; bcrypt
+# releases the GIL, so cap how many hashes run at once to the core count
+# instead of letting a login burst oversubscribe the CPU.
+BCRYPT_CONCURRENCY = int(os.getenv("BCRYPT_CONCURRENCY", str(os.cpu_count() or 2)))
+_BCRYPT_SLOTS = threading.BoundedSemaphore(max(1, BCRYPT_CONCURRENCY))
+
+
+def password_bytes(password: str) -> bytes:
+    """UTF-8 bytes capped at bcrypt's 72-byte limit, never splitting a character."""
+    raw = password.encode("utf-8")
+    if len(raw) <= 72:
+        return raw
+    return raw[:72].decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    pw = password_bytes(password)
+    with _BCRYPT_SLOTS:
+        return bcrypt.hashpw(pw, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    pw = password_bytes(password)
+    with _BCRYPT_SLOTS:
+        return bcrypt.checkpw(pw, password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """
+    True when a stored "$2b$<cost>$..." hash is weaker than the configured cost.
+
+    Only upgrades: lowering BCRYPT_ROUNDS (e.g. for test runs) never rewrites
+    existing hashes down to the cheaper cost.
+    """
+    parts = (password_hash or "").split("$")
+    try:
+        return int(parts[2]) < rounds
+    except (IndexError, ValueError):
+        return False
+
+
+_DUMMY_HASH: bytes | None = None
+
+
+def dummy_verify(password: str) -> None:
+    """
+    Spend the same bcrypt time as verify_password for an unknown account,
+    so response timing doesn't reveal whether the identifier exists.
+    """
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(BCRYPT_ROUNDS))
+    pw = password_bytes(password)
+    with _BCRYPT_SLOTS:
+        bcrypt.checkpw(pw, _DUMMY_HASH)